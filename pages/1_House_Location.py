@@ -10,7 +10,14 @@ if zip_code:
     # Get weather info based on zip code
     st.session_state["zip_code"] = zip_code
     st.write(f"Zip code saved: {zip_code}")
-    weather_df = get_weather_info(zip_code)
+    # Resolve the zip code once; later lookups reuse this context
+    try:
+        location = resolve_location(zip_code)
+    except ValueError as e:
+        st.error(f"Error: {e}")
+        st.stop()
+    st.session_state["location"] = location
+    weather_df = get_weather_info(location)
     st.session_state["summer_avg_temp"] = weather_df["summer_avg_temp"].iloc[0]
     st.session_state["winter_avg_temp"] = weather_df["winter_avg_temp"].iloc[0]
     st.session_state["HDH"] = weather_df["HDH"].iloc[0]
@@ -22,7 +29,7 @@ if zip_code:
     st.session_state["climatezone"] = weather_df["Climate Zone"].iloc[0]
 
     # Get EnergyStar climatezone
-    energystar_zone = get_energystar_zone(zip_code)
+    energystar_zone = get_energystar_zone(location)
     st.session_state["energystar_zone"] = energystar_zone
 
     # Get heating and cooling period
@@ -72,8 +72,8 @@ sv = calculate_surface_volume_ratio(conditioned_area, house_type, stories,
 orient = convert_orientation(orientation)
 
 # Determine house infiltration level
-zip_code = st.session_state["zip_code"]
-infiltration = get_infiltration(zip_code, floor_area, vintage)
+location = st.session_state.get("location") or st.session_state["zip_code"]
+infiltration = get_infiltration(location, floor_area, vintage)
 match = re.match(r'Option=(\d+)', infiltration)
 if match:
     infiltration = int(match.group(1))
@@ -1,54 +1,19 @@
 import streamlit as st
-import pickle
 import numpy as np
 import pandas as pd
 from utils import Home, plot_energy_contributions, plot_energy_contributions_pie
 from zipcodeutility import ZipCodeUtility
-import category_encoders as ce
+from prediction import HouseProfile, WindowSpec, get_default_pipeline, add_window_costs, WINDOW_LIFESPAN
 # from IPython import embed
 
 st.title("View the Results")
 
-# Load the trained model from a .pkl file
-## List of model file names and corresponding target variables
-model_files = {
-    "cooling_window": "models/cooling_window_lightgbm_lineartree.pkl",
-    "heating_window": "models/heating_window_lightgbm_lineartree.pkl",
-    "cooling_load": "models/cooling_load_lightgbm_lineartree.pkl",
-    "heating_load": "models/heating_load_lightgbm_lineartree.pkl"
-}
-
-# Load the models into a dictionary
-models = {}
-for target, model_file in model_files.items():
-    try:
-        with open(model_file, "rb") as file:
-            models[target] = pickle.load(file)
-    except FileNotFoundError:
-        st.error(f"Model file for {target} not found. Please upload or specify the correct path.")
-        st.stop()
-
-# Load encoders
-@st.cache_resource
-def load_target_encoders():
-    with open("models/target_encoders.pkl", "rb") as f:
-        return pickle.load(f)
-
-def load_onehot_encoder():
-    with open("models/onehot_encoder.pkl", "rb") as f:
-        return pickle.load(f)
-
-def load_label_encoder():
-    with open("models/label_encoder.pkl", "rb") as f:
-        return pickle.load(f)
-
-onehot_encoded_conditions = ['vintage']
-target_encoded_conditions = ['climatezone', 'zip_code']
-label_encoded_conditions = ['vintage']
-
-target_encoders = load_target_encoders()
-onehot_encoder = load_onehot_encoder()
-label_encoder = load_label_encoder()
+# Load the trained models and compiled encoders; the registry reads each artifact once per process
+try:
+    pipeline = get_default_pipeline()
+except FileNotFoundError as e:
+    st.error(f"{e} Please upload or specify the correct path.")
+    st.stop()
 
 #Define general variables
 is_cooling = st.session_state["is_cooling"]
@@ -65,7 +30,7 @@ summer_bill = st.session_state["summer_bill"]
 winter_bill = st.session_state["winter_bill"]
 baseline = st.session_state["baseline"]
 energystar_zone = st.session_state["energystar_zone"]
-lifespan = 15
+lifespan = WINDOW_LIFESPAN
 
 def show_results(df):
     for i, row in df.iterrows():
@@ -155,101 +120,18 @@ if "combined_window_database" in st.session_state and all(
     # Initialize results DataFrame
     results = combined_window_database[["window_name"]].copy()
 
-    # Prepare predictors for each window
-    for _, row in combined_window_database.iterrows():
-        predictors = []
-        predictors.append({
-            "climatezone": st.session_state["climatezone"],
-            "zip_code": st.session_state["zip_code"],
-            "vintage": st.session_state["vintage"],
-            "orientation": st.session_state["orientation"],
-            # "window_type": row["window_type"],
-            "wwr": st.session_state["wwr"],
-            "window_area": st.session_state["window_area"],
-            "U-factor": row["U-factor"],
-            "SHGC": row["SHGC"],
-            "cooling_setpoint": st.session_state["cooling_setpoint"],
-            "heating_setpoint": st.session_state["heating_setpoint"],
-            "HDH": st.session_state["HDH"],
-            "CDH": st.session_state["CDH"],
-            "winter_avg_temp": st.session_state["winter_avg_temp"],
-            "summer_avg_temp": st.session_state["summer_avg_temp"],
-            "GHI": st.session_state["GHI"],
-            "conditioned_area": st.session_state["conditioned_area"],
-            "sv": st.session_state["sv"],
-            "total_bills": st.session_state["total_bills"],
-            "infiltration": st.session_state["infiltration"]
-        })
-
-        # Convert predictors to a NumPy array for prediction
-        predictors_df = pd.DataFrame(predictors)
+    # House-level inputs are shared by every window; only U-factor and SHGC vary
+    house = HouseProfile.from_mapping(st.session_state)
+    windows = WindowSpec.from_frame(combined_window_database)
 
-        # Apply encoders
-        label_encoded = label_encoder.fit_transform(predictors_df[label_encoded_conditions])
-        # Convert the NumPy array to a DataFrame with appropriate column names
-        label_encoded_df = pd.DataFrame(
-            label_encoded,
-            columns=label_encoded_conditions,
-            index=predictors_df.index  # Use the same index as the original DataFrame
-        )
-        # # Apply onehot encoding
-        predictors_ready = predictors_df.drop(columns=label_encoded_conditions, axis=1).join(label_encoded_df)
-
-        # Make predictions for each target using the respective model
-        for target, model in models.items():
-            # Apply target-specific encoding
-            encoder = target_encoders[target]
-            encoded_predictors = encoder.transform(predictors_ready[target_encoded_conditions])
-            X = predictors_ready.drop(columns=target_encoded_conditions, axis=1).join(encoded_predictors)
-            # Ensure compatibility with the model
-            X = X[model["features"]].to_numpy()
-
-            # Make predictions
-            predictions = model["model"].predict(X)[0]
-
-            # Add the prediction to the results DataFrame
-            if target not in results.columns:
-                results[target] = None  # Initialize the column if it doesn't exist
-
-            results.loc[results["window_name"] == row["window_name"], target] = predictions
+    # One shared feature matrix for all windows; the targets' models run concurrently
+    predictions = pipeline.predict(house, windows)
+    for target in predictions.columns:
+        results[target] = predictions[target].to_numpy()
     # embed()
-    # Apply Logic to Update Results
-    if is_cooling==0:
-        results["cooling_load"] = 0
-    if is_heating==0:
-        results["heating_load"] = 0
-
-    # Add percentage columns to the results DataFrame
-    # Calculate percentages only when cooling_load and heating_load are > 0.5
-    results["cooling_window_percent"] = results.apply(
-        lambda row: (row["cooling_window"] / row["cooling_load"]) * 100 if row["cooling_load"] > 5 else 0, axis=1
-    )
-    results["heating_window_percent"] = results.apply(
-        lambda row: (row["heating_window"] / row["heating_load"]) * 100 if row["heating_load"] > 5 else 0, axis=1
-    )
-    # # Add an average percentage for sorting
-    # results["average_percent"] = results.apply(
-    #     lambda row: row["heating_window_percent"] if row["cooling_load"] == 0 else
-    #     row["cooling_window_percent"] if row["heating_load"] == 0 else
-    #     (row["cooling_window_percent"] + row["heating_window_percent"]) / 2,
-    #     axis=1
-    # )
-
-    # Add a $ value for corresponding window type based on user's utility bills
-    results["annual_cooling_cost"] = results.apply(
-        lambda row: (row["cooling_window_percent"] /100 * summer_bill * cooling_period) if row["cooling_load"] > 5 else 0, axis = 1
-    )
-    results["lifetime_cooling_cost"] = results["annual_cooling_cost"] * lifespan
-    results["annual_heating_cost"] = results.apply(
-        lambda row: (row["heating_window_percent"] / 100 * winter_bill * heating_period) if row["heating_load"] > 5 else 0, axis=1
-    )
-    results["lifetime_heating_cost"] = results["annual_heating_cost"] * lifespan
-
-    # Total bills for window cooling + heating
-    results["annual_total_cost"] = results.apply(
-        lambda row: (row["annual_cooling_cost"] + row["annual_heating_cost"]), axis=1
-    )
-    results["lifetime_total_cost"] = results["lifetime_cooling_cost"]+results["lifetime_heating_cost"]
+    # Share of the utility bills attributable to each window
+    add_window_costs(results, summer_bill, winter_bill, cooling_period, heating_period,
+                     is_cooling, is_heating, lifespan)
 
     # Baseline result
     baseline_result = results.loc[results["window_name"] == baseline]
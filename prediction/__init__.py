@@ -0,0 +1,79 @@
+# __init__.py
+
+import importlib
+
+# Public objects are imported from their submodule on first access, so running a submodule
+# ('python -m prediction.registry') does not import it a second time through the package
+_EXPORTS = {
+    # The model input types from features.py
+    "HouseProfile": "features",
+    "WindowSpec": "features",
+    "FeatureBuilder": "features",
+    # The compiled encoders from encoders.py
+    "CompiledLabelEncoder": "encoders",
+    "CompiledTargetEncoder": "encoders",
+    "CompiledEncoders": "encoders",
+    "check_compiled_encoders": "encoders",
+    # The NumPy tree evaluator from flat.py
+    "FlatEnsemble": "flat",
+    "export_flat_model": "flat",
+    "load_flat_model": "flat",
+    # The prediction cache from cache.py
+    "PredictionCache": "cache",
+    "row_keys": "cache",
+    # The multi-target pipeline from pipeline.py
+    "InferencePipeline": "pipeline",
+    "get_default_pipeline": "pipeline",
+    # The window cost attribution from costs.py
+    "add_window_costs": "costs",
+    # The model registry from registry.py
+    "ModelRegistry": "registry",
+    "get_default_registry": "registry",
+    "file_sha256": "registry",
+    # Settings from config.py
+    "MODELS_DIR": "config",
+    "HOUSE_FEATURES": "config",
+    "WINDOW_FEATURES": "config",
+    "TARGETS": "config",
+    "WINDOW_LIFESPAN": "config",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+# Define __all__ to specify public objects of the module
+__all__ = [
+    "HouseProfile",
+    "WindowSpec",
+    "FeatureBuilder",
+    "CompiledLabelEncoder",
+    "CompiledTargetEncoder",
+    "CompiledEncoders",
+    "check_compiled_encoders",
+    "FlatEnsemble",
+    "export_flat_model",
+    "load_flat_model",
+    "PredictionCache",
+    "row_keys",
+    "InferencePipeline",
+    "get_default_pipeline",
+    "add_window_costs",
+    "ModelRegistry",
+    "get_default_registry",
+    "file_sha256",
+    "MODELS_DIR",
+    "HOUSE_FEATURES",
+    "WINDOW_FEATURES",
+    "TARGETS",
+    "WINDOW_LIFESPAN"
+]
@@ -0,0 +1,343 @@
+# batch.py
+"""
+Score a file of house records against a window catalog without the Streamlit app.
+
+Houses are read in fixed-size chunks from CSV or Parquet, go through the same
+location resolution, feature derivation, models and cost attribution as the
+app's pages, and the ranked windows of each chunk are appended to the output
+before the next chunk is read, so memory use does not grow with the input.
+
+Input columns (one row per house; names follow the app's inputs):
+- required: zip_code, vintage, house_type, orientation (e.g. 'South'), floor_area, stories
+- optional: house_id (default: row number), basement_area (0; > 0 means a heated basement),
+  is_cooling / is_heating (1), cooling_setpoint (75), heating_setpoint (68),
+  summer_bill / winter_bill (0), wwr (15), baseline (the catalog's first non-ENERGY STAR window),
+  blinds_percent (0)
+
+Every target needs a model in the models directory (python -m prediction.registry list).
+Zip codes are resolved from the ZIP atlas (python -m zipcodeweather.atlas build) where
+possible; the rest are geocoded in one batch, at Nominatim's rate limit of about one
+zip code per second, so build the atlas before scoring large files.
+
+Usage: python -m prediction.batch houses.csv results.csv [--windows data/window_data.csv]
+       [--chunk-size 500] [--models-dir models/]
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from .config import MODELS_DIR, WINDOW_FEATURES
+from .costs import add_window_costs
+from .pipeline import InferencePipeline
+from .registry import ModelRegistry
+
+REQUIRED_COLUMNS = ["zip_code", "vintage", "house_type", "orientation", "floor_area", "stories"]
+DEFAULTS = {"basement_area": 0, "is_cooling": 1, "is_heating": 1, "cooling_setpoint": 75, "heating_setpoint": 68,
+            "summer_bill": 0.0, "winter_bill": 0.0, "wwr": 15, "blinds_percent": 0.0}
+DEFAULT_WINDOW_DATABASE_PATH = os.path.join(os.path.dirname(__file__), "../data/window_data.csv")
+DEFAULT_CHUNK_SIZE = 500
+
+# Station attributes used as model inputs and for the heating/cooling periods
+STATION_COLUMNS = ["winter_avg_temp", "summer_avg_temp", "HDH", "CDH", "HDD", "CDD", "GHI"]
+
+
+def read_chunks(path, chunk_size):
+    """
+    Yield DataFrames of at most chunk_size house records from a CSV or Parquet file.
+    """
+    if path.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype={"zip_code": str, "house_id": str})
+
+
+class ChunkWriter:
+    """
+    Appends result chunks to a CSV or Parquet file as they are produced.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith((".parquet", ".pq"))
+        self._writer = None
+        self._started = False
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def load_window_catalog(path=DEFAULT_WINDOW_DATABASE_PATH):
+    """
+    The window catalog, named by window type as on the Window Information page.
+    """
+    windows = pd.read_csv(path)
+    if "window_name" not in windows.columns:
+        windows["window_name"] = windows["window_type"]
+    return windows
+
+
+def default_baseline(windows):
+    """
+    The app's default baseline: the first window type that is not ENERGY STAR.
+    """
+    return windows.loc[~windows["window_name"].str.contains("ENERGY STAR"), "window_name"].iloc[0]
+
+
+def prepare_houses(houses, windows, first_id=0):
+    """
+    Check the required columns of house records and fill in the optional ones.
+
+    Parameters:
+    - houses (pd.DataFrame): House records as read from the input.
+    - windows (pd.DataFrame): The window catalog (for the default baseline).
+    - first_id (int): house_id of the first record if the input has no house_id column.
+
+    Returns:
+    - pd.DataFrame: A copy of houses with every optional column present.
+
+    Raises:
+    - ValueError: If a required column is missing.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in houses.columns]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+    houses = houses.copy()
+    if "house_id" not in houses.columns:
+        houses["house_id"] = np.arange(first_id, first_id + len(houses)).astype(str)
+    for column, default in DEFAULTS.items():
+        houses[column] = houses[column].fillna(default) if column in houses.columns else default
+    baseline = default_baseline(windows)
+    houses["baseline"] = houses["baseline"].fillna(baseline) if "baseline" in houses.columns else baseline
+    houses["zip_code"] = houses["zip_code"].astype(str).str.strip()
+    return houses
+
+
+def resolve_locations(zip_codes):
+    """
+    Location-derived inputs of each distinct zip code, resolved in bulk.
+
+    Zip codes in the prebuilt ZIP atlas are read from it. The rest are geocoded
+    together by get_coordinates_many (gazetteer, geocode cache, then Nominatim
+    at its rate limit), and their stations and climate zones are found with one
+    vectorized query each, as resolve_location would find them one at a time.
+
+    Returns:
+    - tuple: (pd.DataFrame indexed by zip code with 'climatezone', 'energystar_zone' and the
+      station columns; dict of zip code -> error message for zip codes that could not be resolved)
+    """
+    from zipcodeweather import (get_default_atlas, get_weather_stations, get_coordinates_many,
+                                find_nearest_weather_stations, get_climate_zones_from_geojson)
+    from zipcodeutility import get_zip_index
+
+    unique = list(dict.fromkeys(zip_codes))
+    stations = get_weather_stations()
+    rows, errors = {}, {}
+
+    atlas = get_default_atlas()
+    pending = []
+    for zip_code in unique:
+        try:
+            entry = atlas.lookup(zip_code) if atlas is not None else None
+        except ValueError:
+            entry = None
+        if entry is None:
+            pending.append(zip_code)
+        else:
+            rows[zip_code] = {"climatezone": entry["climate_zone"]["BA_Climate_Zone"],
+                              **stations.iloc[entry["station_index"]][STATION_COLUMNS].to_dict()}
+
+    if pending:
+        coordinates = get_coordinates_many(pending)
+        located = [(z, c) for z, c in zip(pending, coordinates) if c is not None]
+        errors.update({z: "could not be geocoded" for z, c in zip(pending, coordinates) if c is None})
+        if located:
+            lats = [c[0] for _, c in located]
+            lons = [c[1] for _, c in located]
+            nearest = find_nearest_weather_stations(lats, lons, stations, refine=True)
+            zones = get_climate_zones_from_geojson(lats, lons)
+            for i, (zip_code, _) in enumerate(located):
+                if not zones["found"].iloc[i]:
+                    errors[zip_code] = "outside every climate zone"
+                    continue
+                rows[zip_code] = {"climatezone": zones["BA_Climate_Zone"].iloc[i],
+                                  **nearest.iloc[i][STATION_COLUMNS].to_dict()}
+
+    resolved = list(rows)
+    # Zip codes missing from ClimateZones_County.csv have no ENERGY STAR zone, as in resolve_location
+    energystar = get_zip_index().lookup_many(resolved)["energystar_zone"].to_numpy()
+    for zip_code, zone in zip(resolved, energystar):
+        rows[zip_code]["energystar_zone"] = zone
+    return pd.DataFrame.from_dict(rows, orient="index", columns=["climatezone", "energystar_zone", *STATION_COLUMNS]), errors
+
+
+def derive_features(houses):
+    """
+    House-level model inputs derived the way pages 1-3 derive them.
+
+    Parameters:
+    - houses (pd.DataFrame): House records with defaults filled and locations joined.
+    Returns:
+    - pd.DataFrame: houses with vintage, orientation, conditioned_area, sv, window_area,
+      heating/cooling periods and total_bills set.
+    """
+    from preprocessing import (calculate_surface_volume_ratios, calculate_predicted_window_areas,
+                               convert_orientations, calculate_periods)
+
+    houses["vintage"] = houses["vintage"].replace(">2010", "2010s")
+    houses["orientation"] = convert_orientations(houses["orientation"])
+    houses["conditioned_area"] = houses["floor_area"] + houses["basement_area"]
+    # The pages derive geometry with a heated basement regardless of the foundation input
+    houses["sv"] = calculate_surface_volume_ratios(houses["conditioned_area"], houses["house_type"],
+                                                   houses["stories"], "Heated Basement")
+    houses["window_area"] = calculate_predicted_window_areas(houses["conditioned_area"], houses["house_type"],
+                                                             houses["stories"], houses["wwr"], "Heated Basement")
+    houses["heating_period"], houses["cooling_period"] = calculate_periods(houses["HDD"], houses["CDD"])
+    houses["total_bills"] = (houses["summer_bill"] * houses["cooling_period"]
+                             + houses["winter_bill"] * houses["heating_period"])
+    # Without air conditioning / heating the pages record a setpoint of 0
+    houses["cooling_setpoint"] = np.where(houses["is_cooling"].astype(bool), houses["cooling_setpoint"], 0)
+    houses["heating_setpoint"] = np.where(houses["is_heating"].astype(bool), houses["heating_setpoint"], 0)
+    return houses
+
+
+def score_chunk(houses, windows, pipeline):
+    """
+    Score one chunk of houses against every window and rank the windows of each house.
+
+    Houses are told apart by their position in the chunk, so house_id is carried
+    through as data and need not be unique.
+
+    Returns:
+    - tuple: (ranked results DataFrame indexed by the position of its house in the chunk ('row'),
+      dict of position -> reason for houses that were skipped)
+    """
+    houses = houses.reset_index(drop=True)
+    locations, zip_errors = resolve_locations(houses["zip_code"])
+    skipped = {i: f"zip code {zip_code}: {zip_errors[zip_code]}"
+               for i, zip_code in enumerate(houses["zip_code"]) if zip_code in zip_errors}
+    houses = houses.join(locations, on="zip_code", how="inner")
+    houses = derive_features(houses)
+
+    invalid = houses[["orientation", "sv", "window_area"]].isna().any(axis=1)
+    invalid |= ~houses["baseline"].isin(windows["window_name"])
+    # Labels the encoders were not fitted on (e.g. a misspelt vintage) would fail the whole chunk
+    for feature, encoder in pipeline.encoders.label_encoders.items():
+        invalid |= ~houses[feature].isin(list(encoder.positions))
+    for i in houses.index[invalid]:
+        skipped[i] = "unknown vintage, house type, orientation or baseline window"
+    houses = houses.loc[~invalid]
+    if houses.empty:
+        return pd.DataFrame(), skipped
+
+    # One row per (house, window); blinds reduce SHGC as on the Window Information page
+    n_windows = len(windows)
+    row = houses.index.repeat(n_windows)
+    rows = houses.loc[row].reset_index(drop=True)
+    for column in ["window_name", *WINDOW_FEATURES]:
+        rows[column] = np.tile(windows[column].to_numpy(), len(houses))
+    rows["SHGC"] = rows["SHGC"] * (100.0 - rows["blinds_percent"]) * 0.01
+
+    predictions = pipeline.predict_frame(rows)
+
+    results = rows[["house_id", "zip_code", "window_name"]].copy()
+    for target in predictions.columns:
+        results[target] = predictions[target].to_numpy()
+    add_window_costs(results, rows["summer_bill"].to_numpy(dtype=float), rows["winter_bill"].to_numpy(dtype=float),
+                     rows["cooling_period"].to_numpy(), rows["heating_period"].to_numpy(),
+                     rows["is_cooling"].to_numpy(), rows["is_heating"].to_numpy())
+
+    # Money saved compared to each house's baseline window
+    is_baseline = (rows["window_name"] == rows["baseline"]).to_numpy()
+    groups = results.groupby(row, sort=False)
+    for column, source in [("cost_difference", "annual_total_cost"), ("cooling_difference", "lifetime_cooling_cost"),
+                           ("heating_difference", "lifetime_heating_cost")]:
+        baseline_value = results[source].where(is_baseline).groupby(row, sort=False).transform("first")
+        results[column] = baseline_value - results[source]
+    results["is_baseline"] = is_baseline
+    # Zip codes outside ClimateZones_County.csv have no zone (NaN) and no recommended window
+    results["energystar_recommended"] = [pd.notna(zone) and zone in name for zone, name in
+                                         zip(rows["energystar_zone"], rows["window_name"])]
+    results["rank"] = groups["lifetime_total_cost"].rank(method="first").astype(int)
+    results.index = pd.Index(row, name="row")
+    results = results.sort_values(["row", "rank"], kind="stable")
+    return results, skipped
+
+
+def score_file(input_path, output_path, windows_path=DEFAULT_WINDOW_DATABASE_PATH,
+               chunk_size=DEFAULT_CHUNK_SIZE, models_dir=MODELS_DIR, log=sys.stderr, allow_unverified=False):
+    """
+    Stream a file of houses through the models and write ranked results chunk by chunk.
+
+    Returns:
+    - dict: 'houses' scored, 'skipped' houses and 'rows' written.
+    """
+    windows = load_window_catalog(windows_path)
+    pipeline = InferencePipeline.from_registry(ModelRegistry(models_dir, allow_unverified=allow_unverified))
+    writer = ChunkWriter(output_path)
+    counts = {"houses": 0, "skipped": 0, "rows": 0}
+    row_offset = 0
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            chunk = prepare_houses(chunk, windows, row_offset)
+            row_offset += len(chunk)
+
+            results, skipped = score_chunk(chunk, windows, pipeline)
+            for i, reason in skipped.items():
+                print(f"Skipping house {chunk['house_id'].iloc[i]}: {reason}", file=log)
+            if not results.empty:
+                writer.write(results)
+            counts["houses"] += len(chunk) - len(skipped)
+            counts["skipped"] += len(skipped)
+            counts["rows"] += len(results)
+    finally:
+        writer.close()
+        pipeline.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score house records against a window catalog.")
+    parser.add_argument("input", help="CSV or Parquet file of house records")
+    parser.add_argument("output", help="CSV or Parquet file for the ranked results")
+    parser.add_argument("--windows", default=DEFAULT_WINDOW_DATABASE_PATH, help="window catalog CSV")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="houses per chunk")
+    parser.add_argument("--models-dir", default=MODELS_DIR, help="directory holding the models and encoders")
+    parser.add_argument("--allow-unverified", action="store_true",
+                        help="load model pickles that are not in the models directory's manifest")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        counts = score_file(args.input, args.output, args.windows, args.chunk_size, args.models_dir,
+                            allow_unverified=args.allow_unverified)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    print(f"Scored {counts['houses']} houses ({counts['skipped']} skipped), wrote {counts['rows']} rows "
+          f"to {args.output} in {elapsed:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from .config import PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_DIR
+
+# Share of max_entries freed whenever the on-disk table is trimmed
+DISK_EVICTION_HEADROOM = 0.1
+
+
+def row_keys(model_version, X):
+    """
+    Content-addressed keys of model input rows.
+
+    A key hashes the model version together with the exact bytes of the encoded
+    float64 row, so it is stable across processes and changes whenever either
+    the model or any input does.
+
+    Parameters:
+    - model_version (str): Identifies the model, e.g. the SHA-256 of its artifact.
+    - X (np.ndarray): Encoded input rows in the model's feature order.
+
+    Returns:
+    - list: One hex key per row.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    prefix = hashlib.blake2b(model_version.encode(), digest_size=16)
+    keys = []
+    for row in X:
+        digest = prefix.copy()
+        digest.update(row.tobytes())
+        keys.append(digest.hexdigest())
+    return keys
+
+
+class PredictionCache:
+    """
+    A bounded LRU cache of model predictions, optionally backed by SQLite.
+
+    Memory holds the most recently used max_entries predictions. With a cache
+    directory, every prediction is also written to disk, and memory misses are
+    looked up there before the model is run, so results survive restarts.
+    Reads never write to disk: the access times of disk hits are saved with the
+    next set_many, and the table is trimmed only once it grows past max_entries.
+    Hits (memory or disk), misses and evictions are counted per process.
+    """
+
+    def __init__(self, max_entries=PREDICTION_CACHE_MAX_ENTRIES, cache_dir=PREDICTION_CACHE_DIR):
+        """
+        Parameters:
+        - max_entries (int): Maximum number of predictions kept in memory (and on disk).
+        - cache_dir (str): Directory holding prediction_cache.sqlite; None keeps the cache in memory only.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        # Access times of disk hits, written with the next batch of predictions rather than on read
+        self._accessed = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.path = os.path.join(cache_dir, "prediction_cache.sqlite")
+            # The thread pool scores targets concurrently, so share one connection behind the lock
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS prediction (key TEXT PRIMARY KEY, value REAL, accessed REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS prediction_accessed ON prediction (accessed)")
+            self._conn.commit()
+            # Upper bound on the rows on disk (replaced keys are counted again); recounted before evicting
+            self._disk_rows = self._conn.execute("SELECT COUNT(*) FROM prediction").fetchone()[0]
+
+    def get_many(self, keys):
+        """
+        Look up cached predictions.
+
+        Parameters:
+        - keys (list): Keys from row_keys.
+
+        Returns:
+        - tuple: (values array, NaN on a miss; boolean hit mask)
+        """
+        values = np.full(len(keys), np.nan)
+        hit = np.zeros(len(keys), dtype=bool)
+        with self._lock:
+            missing = []
+            for i, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    values[i], hit[i] = value, True
+            self.hits += len(keys) - len(missing)
+
+            if missing and self._conn is not None:
+                found = self._disk_get([keys[i] for i in missing])
+                still_missing = []
+                for i in missing:
+                    value = found.get(keys[i])
+                    if value is None:
+                        still_missing.append(i)
+                    else:
+                        values[i], hit[i] = value, True
+                        self._remember(keys[i], value)
+                self.disk_hits += len(missing) - len(still_missing)
+                missing = still_missing
+            self.misses += len(missing)
+        return values, hit
+
+    def set_many(self, keys, values):
+        """
+        Store predictions, evicting the least recently used ones if the cache is full.
+        """
+        values = [float(v) for v in values]
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._remember(key, value)
+            if self._conn is not None:
+                now = time.time()
+                self._flush_accessed()
+                self._conn.executemany("INSERT OR REPLACE INTO prediction (key, value, accessed) VALUES (?, ?, ?)",
+                                       [(key, value, now) for key, value in zip(keys, values)])
+                self._disk_rows += len(keys)
+                if self._disk_rows > self.max_entries:
+                    self._disk_evict()
+                self._conn.commit()
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, keys):
+        found = {}
+        # Stay under SQLite's limit on bound parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(self._conn.execute(f"SELECT key, value FROM prediction WHERE key IN ({marks})", chunk))
+        now = time.time()
+        self._accessed.update((key, now) for key in found)
+        return found
+
+    def _flush_accessed(self):
+        # Record the access times of disk hits so eviction sees them (the caller commits)
+        if self._accessed:
+            self._conn.executemany("UPDATE prediction SET accessed = ? WHERE key = ?",
+                                   [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def _disk_evict(self):
+        # Counted only once the estimate passes max_entries, then trimmed with headroom so that
+        # the next trim is DISK_EVICTION_HEADROOM * max_entries writes away rather than one
+        self._disk_rows = self._conn.execute("SELECT COUNT(*) FROM prediction").fetchone()[0]
+        if self._disk_rows > self.max_entries:
+            keep = int(self.max_entries * (1 - DISK_EVICTION_HEADROOM))
+            self._conn.execute(
+                "DELETE FROM prediction WHERE key IN ("
+                "SELECT key FROM prediction ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (keep,)
+            )
+            self._disk_rows = keep
+
+    def clear(self):
+        """
+        Remove every entry (in memory and on disk) and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._accessed.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM prediction")
+                self._conn.commit()
+                self._disk_rows = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Return cache counters.
+
+        Returns:
+        - dict: 'hits' (memory), 'disk_hits', 'misses', 'evictions', 'hit_rate', 'size'
+          (predictions in memory) and 'disk_size' (None without a cache directory).
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            disk_size = None
+            if self._conn is not None:
+                disk_size = self._conn.execute("SELECT COUNT(*) FROM prediction").fetchone()[0]
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions,
+                    "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                    "size": len(self._entries), "disk_size": disk_size}
@@ -0,0 +1,52 @@
+# config.py
+
+import os
+
+# Base directory of the package
+BASE_DIR = os.path.dirname(__file__)
+
+# Directory holding the trained models and encoders
+MODELS_DIR = os.path.join(BASE_DIR, '../models')
+
+# House-level model inputs, as named in the model feature lists and in st.session_state
+HOUSE_FEATURES = ('climatezone', 'zip_code', 'vintage', 'orientation', 'wwr', 'window_area',
+                  'cooling_setpoint', 'heating_setpoint', 'HDH', 'CDH', 'winter_avg_temp',
+                  'summer_avg_temp', 'GHI', 'conditioned_area', 'sv', 'total_bills', 'infiltration')
+
+# Window-level model inputs: model feature name -> WindowSpec attribute
+WINDOW_FEATURES = {'U-factor': 'u_factor', 'SHGC': 'shgc'}
+
+# Targets predicted for every window
+TARGETS = ('cooling_window', 'heating_window', 'cooling_load', 'heating_load')
+
+# Artifact file names tried for each target, most preferred first. '.txt' is LightGBM's
+# native model format. The older '<target>.pkl' models take one-hot vintage and an encoded
+# window_type that the app does not produce, so they are not candidates.
+MODEL_ARTIFACT_PATTERNS = ('{target}_lightgbm_lineartree.pkl', '{target}_lightgbm.txt', '{target}_lightgbm.pkl')
+
+# Flattened ensembles ('python -m prediction.flat export') score small batches faster than
+# LightGBM and large ones slower (tools/benchmark_flat_models.py: even at about 32 rows).
+# When one is present it is used for batches up to FLAT_MODEL_MAX_ROWS rows only.
+FLAT_MODEL_PATTERN = '{target}_lightgbm_flat.npz'
+FLAT_MODEL_MAX_ROWS = 32
+
+# SHA-256 of each artifact in a models directory; artifacts listed here are verified before loading,
+# and pickles that are not listed are refused unless a registry is built with allow_unverified=True
+MODEL_MANIFEST_NAME = 'manifest.json'
+MODEL_MANIFEST_PATH = os.path.join(MODELS_DIR, MODEL_MANIFEST_NAME)
+
+# Vintage names in the order LabelEncoder assigns their codes (sorted)
+VINTAGES = ('1940s', '1950s', '1960s', '1970s', '1980s', '1990s', '2000s', '2010s', '<1940')
+
+# Categorical features and how they are encoded
+LABEL_ENCODED_FEATURES = ('vintage',)
+TARGET_ENCODED_FEATURES = ('climatezone', 'zip_code')
+
+# Prediction cache: entries kept in memory, and an optional directory for an on-disk copy
+PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get("PREDICTION_CACHE_MAX_ENTRIES", 100000))
+PREDICTION_CACHE_DIR = os.environ.get("PREDICTION_CACHE_DIR") or None
+
+# Years of window service used for lifetime costs
+WINDOW_LIFESPAN = 15
+# Loads at or below this are treated as no cooling/heating need when attributing costs to windows
+MIN_LOAD = 5
@@ -0,0 +1,56 @@
+# costs.py
+
+import numpy as np
+from .config import WINDOW_LIFESPAN, MIN_LOAD
+
+
+def add_window_costs(results, summer_bill, winter_bill, cooling_period, heating_period,
+                     is_cooling=True, is_heating=True, lifespan=WINDOW_LIFESPAN):
+    """
+    Add the share of the utility bills attributable to each window.
+
+    Every argument after results may be a scalar (one house) or an array with
+    one value per row of results (many houses scored together).
+
+    Parameters:
+    - results (pd.DataFrame): 'cooling_window', 'heating_window', 'cooling_load' and
+      'heating_load' predictions, one row per window; modified in place.
+    - summer_bill, winter_bill (float): Monthly utility bills ($).
+    - cooling_period, heating_period (float): Months of cooling and heating.
+    - is_cooling, is_heating (bool): Whether the house has air conditioning / heating;
+      without it the corresponding load is set to 0.
+    - lifespan (int): Years of window service for lifetime costs.
+
+    Returns:
+    - pd.DataFrame: results, with window percentages and annual/lifetime costs.
+    """
+    # Apply Logic to Update Results
+    results["cooling_load"] = np.where(np.asarray(is_cooling) == 0, 0, results["cooling_load"].to_numpy(dtype=float))
+    results["heating_load"] = np.where(np.asarray(is_heating) == 0, 0, results["heating_load"].to_numpy(dtype=float))
+
+    # Calculate percentages only when cooling_load and heating_load are > MIN_LOAD
+    cooling_load = results["cooling_load"].to_numpy(dtype=float)
+    heating_load = results["heating_load"].to_numpy(dtype=float)
+    results["cooling_window_percent"] = np.divide(
+        results["cooling_window"].to_numpy(dtype=float), cooling_load,
+        out=np.zeros(len(results)), where=cooling_load > MIN_LOAD
+    ) * 100
+    results["heating_window_percent"] = np.divide(
+        results["heating_window"].to_numpy(dtype=float), heating_load,
+        out=np.zeros(len(results)), where=heating_load > MIN_LOAD
+    ) * 100
+
+    # Add a $ value for corresponding window type based on user's utility bills
+    results["annual_cooling_cost"] = np.where(
+        cooling_load > MIN_LOAD, results["cooling_window_percent"] / 100 * summer_bill * cooling_period, 0
+    )
+    results["lifetime_cooling_cost"] = results["annual_cooling_cost"] * lifespan
+    results["annual_heating_cost"] = np.where(
+        heating_load > MIN_LOAD, results["heating_window_percent"] / 100 * winter_bill * heating_period, 0
+    )
+    results["lifetime_heating_cost"] = results["annual_heating_cost"] * lifespan
+
+    # Total bills for window cooling + heating
+    results["annual_total_cost"] = results["annual_cooling_cost"] + results["annual_heating_cost"]
+    results["lifetime_total_cost"] = results["lifetime_cooling_cost"] + results["lifetime_heating_cost"]
+    return results
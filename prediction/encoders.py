@@ -0,0 +1,233 @@
+# encoders.py
+
+import numpy as np
+import pandas as pd
+from .config import VINTAGES, LABEL_ENCODED_FEATURES, TARGET_ENCODED_FEATURES
+
+
+# Positions returned by lookup_positions for unknown and missing values
+UNKNOWN, MISSING = -1, -2
+
+
+def lookup_positions(positions, values):
+    """
+    Position of each value in a {category: position} dict.
+
+    Values are factorized first, so the dict is consulted once per distinct value.
+    Like pandas index lookups, 3 and 3.0 are the same category.
+
+    Returns:
+    - tuple: (positions array with UNKNOWN/MISSING for unmatched/NaN values, distinct values)
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object).ravel(), use_na_sentinel=True)
+    unique_positions = np.array([positions.get(u, UNKNOWN) for u in uniques] + [MISSING], dtype=np.int64)
+    # factorize marks missing values with -1, which picks the trailing MISSING entry
+    return unique_positions[codes], uniques
+
+
+class CompiledLabelEncoder:
+    """
+    A fitted LabelEncoder reduced to a class -> code lookup.
+
+    Transforming never refits, so the codes are the ones the models were trained with.
+    """
+
+    def __init__(self, classes, codes=None):
+        """
+        Parameters:
+        - classes (array-like): The labels, in code order unless codes are given.
+        - codes (array-like): Code of each label (default 0..n-1).
+        """
+        self.classes = pd.Index(classes)
+        self.codes = np.arange(len(self.classes)) if codes is None else np.asarray(codes)
+        self.positions = {label: i for i, label in enumerate(self.classes)}
+
+    def transform(self, values):
+        """
+        Codes of an array of labels.
+
+        Raises:
+        - ValueError: If a label was not seen when the encoder was fitted.
+        """
+        idx, uniques = lookup_positions(self.positions, values)
+        if (idx < 0).any():
+            unseen = [u for u in uniques if self.positions.get(u, -1) < 0]
+            raise ValueError(f"y contains previously unseen labels: {unseen}")
+        return self.codes[idx]
+
+
+class CompiledTargetEncoder:
+    """
+    A fitted category_encoders TargetEncoder reduced to per-column lookup arrays.
+
+    Each column's categories index an array of encoded values; unknown and
+    missing categories take the encoder's fallback values (the training mean
+    with the default handle_unknown/handle_missing='value').
+    """
+
+    def __init__(self, columns):
+        """
+        Parameters:
+        - columns (dict): Column -> (categories, encoded values, unknown value, missing value).
+        """
+        self.columns = {col: ({category: i for i, category in enumerate(categories)},
+                              np.asarray(values, dtype=float), float(unknown), float(missing))
+                        for col, (categories, values, unknown, missing) in columns.items()}
+
+    @classmethod
+    def from_encoder(cls, encoder):
+        """
+        Compile a fitted category_encoders.TargetEncoder.
+        """
+        columns = {}
+        for entry in encoder.ordinal_encoder.mapping:
+            col, ordinal = entry["col"], entry["mapping"]
+            target_mapping = encoder.mapping[col]
+            # Missing values are handled separately, so drop the NaN category
+            ordinal = ordinal[ordinal.index.notna()]
+            values = target_mapping.reindex(ordinal.to_numpy()).to_numpy(dtype=float)
+            columns[col] = (ordinal.index, values, target_mapping.loc[-1], target_mapping.loc[-2])
+        return cls(columns)
+
+    def transform_column(self, col, values):
+        """
+        Encoded values of one column.
+        """
+        positions, encoded, unknown, missing = self.columns[col]
+        idx, _ = lookup_positions(positions, values)
+        out = np.where(idx >= 0, encoded[idx], unknown)
+        out[idx == MISSING] = missing
+        return out
+
+    def transform(self, data):
+        """
+        Encode every compiled column of a DataFrame or a mapping of columns.
+
+        Returns:
+        - dict: Column -> float array of encoded values.
+        """
+        return {col: self.transform_column(col, data[col]) for col in self.columns}
+
+
+class CompiledEncoders:
+    """
+    The app's label and target encoders, compiled once at load time.
+    """
+
+    def __init__(self, label_encoders, target_encoders):
+        """
+        Parameters:
+        - label_encoders (dict): Feature -> CompiledLabelEncoder.
+        - target_encoders (dict): Target -> CompiledTargetEncoder.
+        """
+        self.label_encoders = label_encoders
+        self.target_encoders = target_encoders
+
+    @classmethod
+    def from_fitted(cls, label_encoder, target_encoders, vocabulary=VINTAGES):
+        """
+        Compile the fitted encoders loaded from models/.
+
+        The saved label encoder was fitted on the vintage codes 0..8 rather than on
+        the vintage names. Codes follow LabelEncoder's sorted order of the names,
+        which is the order of `vocabulary`.
+
+        Parameters:
+        - label_encoder (LabelEncoder): The fitted label encoder (label_encoder.pkl).
+        - target_encoders (dict): Target -> fitted TargetEncoder (target_encoders.pkl).
+        - vocabulary (list): Vintage names in code order.
+        """
+        classes = np.asarray(label_encoder.classes_)
+        if classes.dtype.kind in "iu":
+            codes = label_encoder.transform(np.arange(len(vocabulary)))
+            vintage = CompiledLabelEncoder(vocabulary, codes)
+        else:
+            vintage = CompiledLabelEncoder(classes)
+        label_encoders = {feature: vintage for feature in LABEL_ENCODED_FEATURES}
+        compiled_targets = {target: CompiledTargetEncoder.from_encoder(encoder)
+                            for target, encoder in target_encoders.items()}
+        return cls(label_encoders, compiled_targets)
+
+    def encode(self, target, data):
+        """
+        Encoded categorical features of a batch for one target's model.
+
+        Parameters:
+        - target (str): The target whose target encoder to use.
+        - data (pd.DataFrame or dict): Raw values of the categorical features.
+
+        Returns:
+        - dict: Feature -> array of encoded values.
+        """
+        encoded = {feature: encoder.transform(data[feature]) for feature, encoder in self.label_encoders.items()}
+        encoded.update(self.target_encoders[target].transform(data))
+        return encoded
+
+
+def check_compiled_encoders(label_encoder, target_encoders, compiled=None):
+    """
+    Compare compiled encoders with the originals on every fitted category,
+    an unknown category and a missing value.
+
+    The original target encoders need the category_encoders version they were
+    pickled with to run transform.
+
+    Returns:
+    - dict: Encoder name -> largest absolute difference (0.0 when they match).
+
+    Raises:
+    - RuntimeError: If the installed category_encoders cannot transform with the pickled encoders.
+    """
+    compiled = compiled or CompiledEncoders.from_fitted(label_encoder, target_encoders)
+    report = {}
+
+    # The reference for the label encoder: LabelEncoder fitted on the vintage names, then the saved encoder
+    from sklearn.preprocessing import LabelEncoder
+    for feature, encoder in compiled.label_encoders.items():
+        names = np.asarray(encoder.classes, dtype=object)
+        codes = LabelEncoder().fit(names).transform(names)
+        if np.asarray(label_encoder.classes_).dtype.kind in "iu":
+            expected = label_encoder.transform(codes)
+        else:
+            expected = label_encoder.transform(names)
+        report[f"label:{feature}"] = float(np.abs(encoder.transform(names) - expected).max())
+
+    for target, encoder in target_encoders.items():
+        probe = {}
+        for entry in encoder.ordinal_encoder.mapping:
+            categories = list(entry["mapping"].index[entry["mapping"].index.notna()])
+            probe[entry["col"]] = categories + ["__unknown__", np.nan]
+        n = max(len(v) for v in probe.values())
+        # Pad the shorter column by repeating its categories
+        frame = pd.DataFrame({col: (values * (n // len(values) + 1))[:n] for col, values in probe.items()})
+        try:
+            expected = encoder.transform(frame)
+        except AttributeError as e:
+            import category_encoders
+            raise RuntimeError(
+                f"category_encoders {category_encoders.__version__} cannot run the pickled target encoders ({e}). "
+                f"They were built with category-encoders 2.6.4, the version pinned in requirements.txt."
+            ) from e
+        actual = compiled.target_encoders[target].transform(frame)
+        report[f"target:{target}"] = float(max(np.abs(actual[col] - expected[col].to_numpy(dtype=float)).max()
+                                              for col in TARGET_ENCODED_FEATURES))
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+    from .registry import get_default_registry
+
+    if len(sys.argv) < 2 or sys.argv[1] != "check":
+        print("Usage: python -m prediction.encoders check")
+        sys.exit(1)
+    registry = get_default_registry()
+    try:
+        report = check_compiled_encoders(registry.artifact("label_encoder.pkl"),
+                                         registry.artifact("target_encoders.pkl"))
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(2)
+    for name, diff in report.items():
+        print(f"{'ok  ' if diff == 0 else 'FAIL'} {name:24s} max abs diff {diff:.3g}")
+    sys.exit(0 if all(diff == 0 for diff in report.values()) else 1)
@@ -0,0 +1,139 @@
+# features.py
+
+import numpy as np
+from .config import HOUSE_FEATURES, WINDOW_FEATURES
+
+
+class HouseProfile:
+    """
+    The house-level inputs of the window models, shared by every window scored for a house.
+
+    Attribute names are the model feature names, so a profile can be built
+    straight from st.session_state.
+    """
+
+    __slots__ = HOUSE_FEATURES
+
+    def __init__(self, climatezone, zip_code, vintage, orientation, wwr, window_area,
+                 cooling_setpoint, heating_setpoint, HDH, CDH, winter_avg_temp, summer_avg_temp,
+                 GHI, conditioned_area, sv, total_bills=None, infiltration=None):
+        self.climatezone = climatezone
+        self.zip_code = zip_code
+        self.vintage = vintage
+        self.orientation = orientation
+        self.wwr = wwr
+        self.window_area = window_area
+        self.cooling_setpoint = cooling_setpoint
+        self.heating_setpoint = heating_setpoint
+        self.HDH = HDH
+        self.CDH = CDH
+        self.winter_avg_temp = winter_avg_temp
+        self.summer_avg_temp = summer_avg_temp
+        self.GHI = GHI
+        self.conditioned_area = conditioned_area
+        self.sv = sv
+        self.total_bills = total_bills
+        self.infiltration = infiltration
+
+    @classmethod
+    def from_mapping(cls, data):
+        """
+        Build a profile from a mapping keyed by feature name (e.g. st.session_state or a CSV row).
+        """
+        return cls(**{name: data[name] for name in HOUSE_FEATURES if name in data})
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in HOUSE_FEATURES)
+        return f"HouseProfile({fields})"
+
+
+class WindowSpec:
+    """
+    A window product to score: its name and thermal properties.
+    """
+
+    __slots__ = ("window_name", "u_factor", "shgc")
+
+    def __init__(self, window_name, u_factor, shgc):
+        self.window_name = window_name
+        self.u_factor = u_factor
+        self.shgc = shgc
+
+    @classmethod
+    def from_frame(cls, window_df):
+        """
+        One WindowSpec per row of a window database with 'window_name', 'U-factor' and 'SHGC' columns.
+        """
+        return [cls(name, u_factor, shgc) for name, u_factor, shgc in
+                zip(window_df["window_name"], window_df["U-factor"], window_df["SHGC"])]
+
+    def __repr__(self):
+        return f"WindowSpec({self.window_name!r}, u_factor={self.u_factor}, shgc={self.shgc})"
+
+
+class FeatureBuilder:
+    """
+    Writes model inputs straight into a float matrix in a model's feature order.
+
+    House-level features are resolved once and broadcast down the matrix; only
+    the window columns differ between rows. Categorical house features (climate
+    zone, zip code, vintage) must be passed already encoded.
+    """
+
+    def __init__(self, features):
+        """
+        Parameters:
+        - features (list): The model's feature names, in the order the model expects.
+        """
+        self.features = list(features)
+        self.window_columns = [(j, WINDOW_FEATURES[name]) for j, name in enumerate(self.features)
+                               if name in WINDOW_FEATURES]
+        self.house_columns = [(j, name) for j, name in enumerate(self.features)
+                              if name not in WINDOW_FEATURES]
+
+    def house_row(self, house, encoded=None):
+        """
+        The house-level part of a model input row.
+
+        Parameters:
+        - house (HouseProfile): The house being scored.
+        - encoded (dict): Encoded values of categorical features; these take precedence
+          over the profile's raw values (and may add features such as one-hot columns).
+
+        Returns:
+        - np.ndarray: One row in feature order, NaN in the window columns.
+        """
+        encoded = encoded or {}
+        row = np.full(len(self.features), np.nan)
+        for j, name in self.house_columns:
+            if name in encoded:
+                row[j] = encoded[name]
+            elif name in HOUSE_FEATURES:
+                row[j] = getattr(house, name)
+            else:
+                raise KeyError(f"Feature '{name}' is neither a house/window input nor encoded.")
+        return row
+
+    def build(self, house, windows, encoded=None, out=None):
+        """
+        Model input matrix for one house and a list of windows.
+
+        Parameters:
+        - house (HouseProfile): The house being scored.
+        - windows (list): WindowSpec per output row.
+        - encoded (dict): Encoded categorical features, see house_row.
+        - out (np.ndarray): Preallocated float matrix of shape (len(windows), len(features)) to fill.
+
+        Returns:
+        - np.ndarray: The filled matrix (out, if given).
+        """
+        shape = (len(windows), len(self.features))
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape:
+            raise ValueError(f"Output matrix has shape {out.shape}, expected {shape}.")
+
+        out[:] = self.house_row(house, encoded)
+        for j, attr in self.window_columns:
+            out[:, j] = np.fromiter((getattr(window, attr) for window in windows), dtype=float, count=len(windows))
+        return out
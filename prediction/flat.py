@@ -0,0 +1,246 @@
+# flat.py
+
+import numpy as np
+
+# LightGBM decision_type bits: default-left flag and the missing-value type in bits 2-3
+DEFAULT_LEFT_MASK = 2
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+# LightGBM treats |x| <= kZeroThreshold as zero for missing_type=Zero
+ZERO_THRESHOLD = 1e-35
+
+
+class FlatEnsemble:
+    """
+    A LightGBM regression ensemble flattened into contiguous NumPy arrays.
+
+    Internal nodes of all trees share one set of arrays (split feature, threshold,
+    children, default direction, missing type); leaves share another. A child index
+    below zero refers to a leaf (~child is the leaf index), as in LightGBM's own
+    model format. Scoring walks every row through every tree at once, one tree
+    level per step, so it needs neither LightGBM nor a Python loop over rows.
+    It beats LightGBM's per-call overhead on small batches (a single house);
+    LightGBM's threaded scorer stays faster on large ones.
+    """
+
+    def __init__(self, features, roots, split_feature, threshold, left_child, right_child,
+                 default_left, missing_type, leaf_value, max_depth, transform="identity"):
+        self.features = list(features)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.split_feature = np.asarray(split_feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left_child = np.asarray(left_child, dtype=np.int32)
+        self.right_child = np.asarray(right_child, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        self.leaf_value = np.asarray(leaf_value, dtype=np.float64)
+        self.max_depth = int(max_depth)
+        self.transform = transform
+        self._child = None
+
+    @classmethod
+    def from_model_string(cls, model_string):
+        """
+        Flatten a model in LightGBM's text format (Booster.model_to_string / save_model).
+
+        Raises:
+        - ValueError: For models the evaluator does not support (multiclass,
+          categorical splits, linear trees, or an unsupported objective).
+        """
+        header, _, body = model_string.partition("\nTree=")
+        meta = dict(line.split("=", 1) for line in header.splitlines() if "=" in line)
+        if int(meta.get("num_tree_per_iteration", 1)) != 1:
+            raise ValueError("Only single-output models can be flattened.")
+        objective = meta.get("objective", "regression").split()
+        if objective[0] in ("regression", "regression_l1", "huber", "fair", "quantile", "mape") and "sqrt" not in objective:
+            transform = "identity"
+        elif objective[0] in ("poisson", "gamma", "tweedie"):
+            transform = "exp"
+        else:
+            raise ValueError(f"Objective '{' '.join(objective)}' is not supported by the flat evaluator.")
+
+        roots, split_feature, threshold, left_child, right_child = [], [], [], [], []
+        default_left, missing_type, leaf_value = [], [], []
+        max_depth = 0
+        for block in ("Tree=" + body).split("\nTree="):
+            block = block.split("end of trees")[0]
+            tree = dict(line.split("=", 1) for line in block.splitlines() if "=" in line)
+            if "num_leaves" not in tree:
+                continue
+            if int(tree.get("num_cat", 0)) > 0:
+                raise ValueError("Categorical splits are not supported by the flat evaluator.")
+            if int(tree.get("is_linear", 0)):
+                raise ValueError("Linear trees are not supported by the flat evaluator.")
+
+            node_offset, leaf_offset = len(split_feature), len(leaf_value)
+            leaves = [float(v) for v in tree["leaf_value"].split()]
+            if int(tree["num_leaves"]) == 1:
+                roots.append(~leaf_offset)
+                leaf_value.extend(leaves)
+                continue
+
+            def shift(children):
+                # Internal nodes move by node_offset, leaves (~index) by leaf_offset
+                return [c + node_offset if c >= 0 else ~(~c + leaf_offset) for c in map(int, children.split())]
+
+            decision = np.array(tree["decision_type"].split(), dtype=np.int64)
+            left, right = shift(tree["left_child"]), shift(tree["right_child"])
+            roots.append(node_offset)
+            split_feature.extend(int(v) for v in tree["split_feature"].split())
+            threshold.extend(float(v) for v in tree["threshold"].split())
+            left_child.extend(left)
+            right_child.extend(right)
+            default_left.extend((decision & DEFAULT_LEFT_MASK) != 0)
+            missing_type.extend((decision >> 2) & 3)
+            leaf_value.extend(leaves)
+            max_depth = max(max_depth, _tree_depth(np.array(left) - node_offset, np.array(right) - node_offset))
+
+        if "average_output" in header.split():
+            leaf_value = list(np.asarray(leaf_value) / len(roots))
+        features = meta["feature_names"].split()
+        return cls(features, roots, split_feature, threshold, left_child, right_child,
+                   default_left, missing_type, leaf_value, max_depth, transform)
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Flatten a trained LGBMRegressor or lightgbm.Booster (the best iteration, if one was recorded).
+        """
+        booster = getattr(model, "booster_", model)
+        return cls.from_model_string(booster.model_to_string())
+
+    def save(self, path):
+        """
+        Write the flattened ensemble to a compressed .npz file.
+        """
+        np.savez_compressed(path, features=np.array(self.features), roots=self.roots,
+                            split_feature=self.split_feature, threshold=self.threshold,
+                            left_child=self.left_child, right_child=self.right_child,
+                            default_left=self.default_left, missing_type=self.missing_type,
+                            leaf_value=self.leaf_value, max_depth=np.array(self.max_depth),
+                            transform=np.array(self.transform))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an ensemble written by save.
+        """
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        return cls(features=[str(f) for f in arrays.pop("features")], max_depth=int(arrays.pop("max_depth")),
+                   transform=str(arrays.pop("transform")), **arrays)
+
+    def _layout(self):
+        """
+        Node arrays for branch-free scoring, built on first use.
+
+        Leaves are appended as nodes that loop back to themselves, so every
+        (row, tree) pair can take max_depth steps without checking whether it
+        has already reached a leaf. child[2 * node + go_right] is the next node.
+        """
+        if self._child is None:
+            n_internal, n_leaves = len(self.threshold), len(self.leaf_value)
+            leaf_nodes = n_internal + np.arange(n_leaves, dtype=np.int32)
+
+            def as_node(children):
+                return np.where(children >= 0, children, n_internal + ~children).astype(np.int32)
+
+            child = np.empty(2 * (n_internal + n_leaves), dtype=np.int32)
+            child[0::2] = np.concatenate([as_node(self.left_child), leaf_nodes])
+            child[1::2] = np.concatenate([as_node(self.right_child), leaf_nodes])
+            self._child = child
+            self._node_feature = np.concatenate([self.split_feature, np.zeros(n_leaves, dtype=np.int32)])
+            self._node_threshold = np.concatenate([self.threshold, np.full(n_leaves, np.inf)])
+            self._node_missing = np.concatenate([self.missing_type, np.zeros(n_leaves, dtype=np.int8)])
+            self._node_default_right = np.concatenate([~self.default_left, np.zeros(n_leaves, dtype=bool)])
+            self._root_nodes = as_node(self.roots)
+            self._n_internal = n_internal
+        return self._child
+
+    def predict(self, X):
+        """
+        Score a batch.
+
+        Parameters:
+        - X (array-like): Rows of inputs in feature order, shape (n_rows, n_features).
+
+        Returns:
+        - np.ndarray: Prediction per row, as LightGBM's predict would return.
+        """
+        child = self._layout()
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        # Handle missing values per node only if some split has a Zero/NaN missing type
+        plain = not self._node_missing.any()
+        if plain:
+            # With missing_type None, LightGBM scores NaN as 0
+            X = np.nan_to_num(X, nan=0.0, posinf=np.inf, neginf=-np.inf)
+        values = X.ravel()
+        row_offset = (np.arange(n_rows) * n_features)[:, np.newaxis]
+
+        node = np.repeat(self._root_nodes[np.newaxis, :], n_rows, axis=0)
+        for _ in range(self.max_depth):
+            x = values[row_offset + self._node_feature[node]]
+            if plain:
+                go_right = x > self._node_threshold[node]
+            else:
+                missing = self._node_missing[node]
+                is_nan = np.isnan(x)
+                x = np.where(is_nan & (missing != MISSING_NAN), 0.0, x)
+                use_default = (((missing == MISSING_ZERO) & (np.abs(x) <= ZERO_THRESHOLD))
+                               | ((missing == MISSING_NAN) & is_nan))
+                go_right = np.where(use_default, self._node_default_right[node], ~(x <= self._node_threshold[node]))
+            node = child[2 * node + go_right]
+
+        raw = self.leaf_value[node - self._n_internal].sum(axis=1)
+        return np.exp(raw) if self.transform == "exp" else raw
+
+
+def _tree_depth(left, right):
+    """
+    Depth (number of splits on the longest path) of one tree given its local child arrays.
+    """
+    depth, level = 0, [0]
+    while level:
+        depth += 1
+        level = [c for n in level for c in (left[n], right[n]) if c >= 0]
+    return depth
+
+
+def export_flat_model(model, path):
+    """
+    Flatten a model dict ({'model', 'features'}) and save it next to the other artifacts.
+
+    Returns:
+    - FlatEnsemble: The flattened ensemble.
+    """
+    flat = FlatEnsemble.from_model(model["model"])
+    if flat.features != list(model["features"]):
+        raise ValueError("Model feature names do not match the booster's feature order.")
+    flat.save(path)
+    return flat
+
+
+def load_flat_model(path):
+    """
+    Load a flattened ensemble as a model dict, the same shape as the pickled models.
+    """
+    flat = FlatEnsemble.load(path)
+    return {"model": flat, "features": flat.features}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    from .registry import get_default_registry
+    from .config import MODELS_DIR, FLAT_MODEL_PATTERN
+
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        print("Usage: python -m prediction.flat export")
+        sys.exit(1)
+    registry = get_default_registry()
+    for target, name in registry.discover().items():
+        path = os.path.join(MODELS_DIR, FLAT_MODEL_PATTERN.format(target=target))
+        flat = export_flat_model(registry.artifact(name), path)
+        print(f"{target:16s} {name} -> {os.path.basename(path)} ({len(flat.roots)} trees, depth {flat.max_depth})")
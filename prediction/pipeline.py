@@ -0,0 +1,159 @@
+# pipeline.py
+
+import hashlib
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from shared import load_once
+from .config import TARGETS, LABEL_ENCODED_FEATURES, TARGET_ENCODED_FEATURES, FLAT_MODEL_MAX_ROWS
+from .features import FeatureBuilder
+from .cache import PredictionCache, row_keys
+
+
+class InferencePipeline:
+    """
+    Scores all targets from one shared feature matrix.
+
+    The targets' models take nearly the same inputs; only the target-encoded
+    columns (climate zone, zip code) differ per target. The base matrix (numeric
+    and label-encoded features) is built once per batch, each target gets a copy
+    in its model's column order with its own encoded columns filled in, and the
+    models run concurrently on a thread pool (LightGBM releases the GIL while
+    scoring).
+    """
+
+    def __init__(self, models, encoders, max_workers=None, cache=None, versions=None, flat_models=None,
+                 flat_max_rows=FLAT_MODEL_MAX_ROWS):
+        """
+        Parameters:
+        - models (dict): Target -> {'model', 'features'}.
+        - encoders (CompiledEncoders): The compiled label and target encoders.
+        - max_workers (int): Threads used to run the models (default one per target, at most
+          one per CPU). With a single worker the models run in the calling thread.
+        - cache (PredictionCache): Cache of predictions by encoded input row; None disables caching.
+        - versions (dict): Target -> model version used in cache keys (default: a hash of the pickled model).
+        - flat_models (dict): Target -> FlatEnsemble of the same model, used instead for batches of at
+          most flat_max_rows rows (it agrees with LightGBM to rounding error).
+        - flat_max_rows (int): Largest batch scored by a flattened ensemble.
+        """
+        self.models = models
+        self.flat_models = flat_models or {}
+        self.flat_max_rows = flat_max_rows
+        self.encoders = encoders
+        self.cache = cache
+        if cache is not None and versions is None:
+            versions = {target: hashlib.sha256(pickle.dumps(model["model"])).hexdigest()
+                        for target, model in models.items()}
+        self.versions = versions
+        # Union of the models' features, in first-seen order
+        self.base_features = list(dict.fromkeys(f for model in models.values() for f in model["features"]))
+        self.builder = FeatureBuilder(self.base_features)
+        position = {feature: j for j, feature in enumerate(self.base_features)}
+        self.columns = {target: np.array([position[f] for f in model["features"]])
+                        for target, model in models.items()}
+        # Columns of each target's matrix that take its target-encoded values
+        self.target_columns = {target: [(j, f) for j, f in enumerate(model["features"]) if f in TARGET_ENCODED_FEATURES]
+                               for target, model in models.items()}
+        max_workers = max_workers or min(len(models), os.cpu_count() or 1)
+        self.executor = (ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+                         if max_workers > 1 else None)
+
+    @classmethod
+    def from_registry(cls, registry, targets=TARGETS, max_workers=None, cache=None):
+        """
+        Pipeline over a registry's models and compiled encoders, versioned by artifact hash.
+        """
+        return cls(registry.models(targets), registry.encoders(), max_workers, cache,
+                   registry.model_versions(targets), registry.flat_models(targets))
+
+    def _run(self, base, target_encoded):
+        """
+        Fill each target's encoded columns on its own copy of the base matrix and score all targets.
+        """
+        def predict(target, X):
+            flat = self.flat_models.get(target)
+            if flat is not None and len(X) <= self.flat_max_rows:
+                return flat.predict(X)
+            return self.models[target]["model"].predict(X)
+
+        def score(target):
+            X = base[:, self.columns[target]]  # fancy indexing copies, so threads never share a matrix
+            for j, feature in self.target_columns[target]:
+                X[:, j] = target_encoded[target][feature]
+            if self.cache is None:
+                return predict(target, X)
+
+            # Only rows whose encoded inputs have not been scored by this model version are run
+            keys = row_keys(self.versions[target], X)
+            predictions, hit = self.cache.get_many(keys)
+            if not hit.all():
+                miss = np.flatnonzero(~hit)
+                predictions[miss] = predict(target, X[miss])
+                self.cache.set_many([keys[i] for i in miss], predictions[miss])
+            return predictions
+
+        if self.executor is None:
+            return {target: score(target) for target in self.models}
+        futures = {target: self.executor.submit(score, target) for target in self.models}
+        return {target: future.result() for target, future in futures.items()}
+
+    def predict(self, house, windows):
+        """
+        Predictions of every target for one house and a list of windows.
+
+        Parameters:
+        - house (HouseProfile): The house being scored.
+        - windows (list): WindowSpec per output row.
+
+        Returns:
+        - pd.DataFrame: One column per target, one row per window.
+        """
+        categorical = {f: [getattr(house, f)] for f in LABEL_ENCODED_FEATURES + TARGET_ENCODED_FEATURES}
+        shared = {f: encoder.transform(categorical[f])[0] for f, encoder in self.encoders.label_encoders.items()}
+        # Target-encoded columns are filled per target; 0.0 is only a placeholder in the base matrix
+        shared.update({f: 0.0 for f in TARGET_ENCODED_FEATURES if f in self.base_features})
+        base = self.builder.build(house, windows, encoded=shared)
+
+        target_encoded = {target: self.encoders.target_encoders[target].transform(categorical) for target in self.models}
+        target_encoded = {target: {f: values[0] for f, values in encoded.items()}
+                          for target, encoded in target_encoded.items()}
+        return pd.DataFrame(self._run(base, target_encoded))
+
+    def predict_frame(self, data):
+        """
+        Predictions of every target for a table of (house, window) rows.
+
+        Parameters:
+        - data (pd.DataFrame): Raw model inputs, one column per feature name ('vintage',
+          'climatezone' and 'zip_code' unencoded).
+
+        Returns:
+        - pd.DataFrame: One column per target, aligned with data's index.
+        """
+        base = np.empty((len(data), len(self.base_features)))
+        for j, feature in enumerate(self.base_features):
+            if feature in self.encoders.label_encoders:
+                base[:, j] = self.encoders.label_encoders[feature].transform(data[feature].to_numpy())
+            elif feature in TARGET_ENCODED_FEATURES:
+                base[:, j] = 0.0
+            else:
+                base[:, j] = data[feature].to_numpy(dtype=float)
+
+        target_encoded = {target: self.encoders.target_encoders[target].transform(data) for target in self.models}
+        return pd.DataFrame(self._run(base, target_encoded), index=data.index)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+
+@load_once
+def get_default_pipeline():
+    """
+    The process-wide pipeline over the default registry's models, with a prediction
+    cache (in memory, plus on disk if PREDICTION_CACHE_DIR is set).
+    """
+    from .registry import get_default_registry
+    return InferencePipeline.from_registry(get_default_registry(), cache=PredictionCache())
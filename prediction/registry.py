@@ -0,0 +1,276 @@
+# registry.py
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from shared import load_once
+from .flat import load_flat_model
+from .config import (MODELS_DIR, TARGETS, MODEL_ARTIFACT_PATTERNS, MODEL_MANIFEST_NAME,
+                     FLAT_MODEL_PATTERN)
+
+ARTIFACT_EXTENSIONS = (".pkl", ".txt", ".npz")
+
+
+def file_sha256(path):
+    """
+    SHA-256 hex digest of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_native_model(path):
+    """
+    Load a model saved in LightGBM's text format (Booster.save_model).
+
+    Returns:
+    - dict: {'model': lightgbm.Booster, 'features': feature names}, the same shape as the pickled models.
+    """
+    import lightgbm as lgb
+    booster = lgb.Booster(model_file=path)
+    return {"model": booster, "features": booster.feature_name()}
+
+
+class ModelRegistry:
+    """
+    Finds the trained models and encoders in a directory and loads each one on first use.
+
+    Every artifact is read at most once per registry; later requests return the
+    loaded object. Artifacts listed in the manifest are hash-checked before they
+    are loaded, and pickles missing from it are refused, since unpickling runs
+    arbitrary code. Nothing here depends on Streamlit, so the app, command-line
+    tools and scripts can share a registry.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, manifest_path=None, patterns=MODEL_ARTIFACT_PATTERNS,
+                 allow_unverified=False):
+        """
+        Parameters:
+        - models_dir (str): Directory holding the artifacts.
+        - manifest_path (str): JSON file of {file name: sha256} (default is manifest.json in models_dir).
+        - patterns (tuple): Candidate file names per target, most preferred first.
+        - allow_unverified (bool): Whether pickles that are not in the manifest may be loaded.
+        """
+        self.models_dir = models_dir
+        self.manifest_path = manifest_path or os.path.join(models_dir, MODEL_MANIFEST_NAME)
+        self.patterns = patterns
+        self.allow_unverified = allow_unverified
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        self._loaded = {}
+        self._encoders = None
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def discover(self, targets=TARGETS):
+        """
+        Artifact file per target, following the preference order of the patterns.
+
+        Returns:
+        - dict: Target -> file name, for the targets that have an artifact.
+        """
+        found = {}
+        for target in targets:
+            for pattern in self.patterns:
+                name = pattern.format(target=target)
+                if os.path.exists(os.path.join(self.models_dir, name)):
+                    found[target] = name
+                    break
+        return found
+
+    def verify(self, name):
+        """
+        Check an artifact against its manifest hash.
+
+        Returns:
+        - bool: True if the hash matches, False if the artifact is not in the manifest.
+        """
+        expected = self.manifest.get(name)
+        if expected is None:
+            return False
+        actual = file_sha256(os.path.join(self.models_dir, name))
+        if actual != expected:
+            raise ValueError(f"Artifact '{name}' does not match its manifest hash "
+                             f"(expected {expected[:12]}, got {actual[:12]}).")
+        return True
+
+    def unverified(self):
+        """
+        Artifacts in models_dir that are not in the manifest, by file name.
+        """
+        return [name for name in self._artifact_names() if name not in self.manifest]
+
+    def artifact(self, name, allow_unverified=None):
+        """
+        Load an artifact by file name, once.
+
+        Parameters:
+        - name (str): File name in models_dir, e.g. 'target_encoders.pkl' or 'heating_load_lightgbm.txt'.
+        - allow_unverified (bool): Whether a pickle that is not in the manifest may be loaded
+          (default is the registry's setting).
+
+        Returns:
+        - object: The unpickled object, or a model dict for LightGBM text models and flattened ensembles.
+
+        Raises:
+        - ValueError: If the artifact does not match its manifest hash, or is a pickle missing from the manifest.
+        """
+        if name in self._loaded:
+            return self._loaded[name]
+        if allow_unverified is None:
+            allow_unverified = self.allow_unverified
+        with self._lock:
+            if name not in self._loaded:
+                path = os.path.join(self.models_dir, name)
+                if not os.path.exists(path):
+                    raise FileNotFoundError(f"Model artifact '{name}' not found in {self.models_dir}.")
+                if not self.verify(name) and name.endswith(".pkl") and not allow_unverified:
+                    raise ValueError(f"Model artifact '{name}' is not in the manifest {self.manifest_path}, "
+                                     f"so it was not unpickled. If you trust it, run "
+                                     f"'python -m prediction.registry manifest {self.models_dir}'.")
+                if name.endswith(".txt"):
+                    self._loaded[name] = load_native_model(path)
+                elif name.endswith(".npz"):
+                    self._loaded[name] = load_flat_model(path)
+                else:
+                    with open(path, "rb") as f:
+                        self._loaded[name] = pickle.load(f)
+        return self._loaded[name]
+
+    def artifact_hash(self, name):
+        """
+        SHA-256 of an artifact: the manifest entry if there is one, else the file's hash (computed once).
+        """
+        if name in self.manifest:
+            return self.manifest[name]
+        if name not in self._hashes:
+            self._hashes[name] = file_sha256(os.path.join(self.models_dir, name))
+        return self._hashes[name]
+
+    def model_versions(self, targets=TARGETS):
+        """
+        Version (artifact hash) of each target's model, keyed by target.
+        """
+        return {target: self.artifact_hash(name) for target, name in self.discover(targets).items()}
+
+    def model(self, target):
+        """
+        The model of a target as {'model': ..., 'features': [...]}.
+        """
+        name = self.discover([target]).get(target)
+        if name is None:
+            candidates = ", ".join(p.format(target=target) for p in self.patterns)
+            raise FileNotFoundError(f"No model artifact for {target} in {self.models_dir} (tried {candidates}).")
+        return self.artifact(name)
+
+    def missing(self, targets=TARGETS):
+        """
+        Targets that have no model artifact in models_dir.
+        """
+        found = self.discover(targets)
+        return [target for target in targets if target not in found]
+
+    def models(self, targets=TARGETS):
+        """
+        Models of several targets, keyed by target.
+
+        Raises:
+        - FileNotFoundError: Naming every target without an artifact, before any model is loaded.
+        """
+        missing = self.missing(targets)
+        if missing:
+            tried = "; ".join(f"{target}: " + ", ".join(p.format(target=target) for p in self.patterns)
+                              for target in missing)
+            raise FileNotFoundError(f"No model artifact for {', '.join(missing)} in {self.models_dir} "
+                                    f"(tried {tried}). Add the trained model(s) and run "
+                                    f"'python -m prediction.registry manifest'.")
+        return {target: self.model(target) for target in targets}
+
+    def flat_models(self, targets=TARGETS):
+        """
+        Flattened ensembles of the targets that have one, keyed by target (see flat.FlatEnsemble).
+        """
+        flat = {}
+        for target in targets:
+            name = FLAT_MODEL_PATTERN.format(target=target)
+            if os.path.exists(os.path.join(self.models_dir, name)):
+                flat[target] = self.artifact(name)["model"]
+        return flat
+
+    def encoders(self):
+        """
+        The label and target encoders compiled into lookup tables (see encoders.CompiledEncoders), built once.
+        """
+        from .encoders import CompiledEncoders
+        if self._encoders is None:
+            compiled = CompiledEncoders.from_fitted(self.artifact("label_encoder.pkl"),
+                                                    self.artifact("target_encoders.pkl"))
+            with self._lock:
+                if self._encoders is None:
+                    self._encoders = compiled
+        return self._encoders
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def _artifact_names(self):
+        return [name for name in sorted(os.listdir(self.models_dir)) if name.endswith(ARTIFACT_EXTENSIONS)]
+
+    def write_manifest(self, manifest_path=None):
+        """
+        Record the hash of every .pkl, .txt and .npz artifact in models_dir.
+
+        Parameters:
+        - manifest_path (str): Where to write it (default is the registry's manifest_path).
+
+        Returns:
+        - dict: The manifest that was written.
+        """
+        manifest = {name: file_sha256(os.path.join(self.models_dir, name)) for name in self._artifact_names()}
+        with open(manifest_path or self.manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        self.manifest = manifest
+        return manifest
+
+
+@load_once
+def get_default_registry():
+    """
+    The process-wide registry over the repository's models directory.
+    """
+    return ModelRegistry()
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    registry = ModelRegistry(sys.argv[2] if len(sys.argv) > 2 else MODELS_DIR)
+    if command == "manifest":
+        print(f"Recorded {len(registry.write_manifest())} artifacts in {registry.manifest_path}")
+    elif command == "verify":
+        for name in sorted(registry.manifest):
+            registry.verify(name)
+            print(f"ok         {name}")
+        unverified = registry.unverified()
+        for name in unverified:
+            print(f"unverified {name}")
+        if unverified:
+            sys.exit(1)
+    elif command == "list":
+        found = registry.discover()
+        for target in TARGETS:
+            print(f"{target:16s} {found.get(target, 'MISSING')}")
+        if len(found) < len(TARGETS):
+            sys.exit(1)
+    else:
+        print("Usage: python -m prediction.registry [list|verify|manifest] [models_dir]")
+        sys.exit(1)
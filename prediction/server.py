@@ -0,0 +1,390 @@
+# server.py
+"""
+Serve the Results page's window recommendations as a local HTTP JSON service.
+
+Requests that arrive within a few milliseconds of each other are gathered into
+one micro-batch and scored together, so every target's model runs once per
+batch rather than once per request; the ranked windows of each house are then
+returned to the request that asked for them.
+
+Endpoints:
+- POST /score   one house as a JSON object, with the fields of prediction.batch's input
+                (zip_code, vintage, house_type, orientation, floor_area, stories, ...);
+                returns {"house_id": ..., "results": [ranked windows]}
+- GET  /stats   request latency (p50/p99), throughput and batch sizes since start
+- GET  /health
+
+Zip codes are looked up in the ZIP atlas (python -m zipcodeweather.atlas build). Any
+other zip code is geocoded on the batching thread at Nominatim's rate limit, holding
+up every request batched with it, so the server refuses to start without a current
+atlas unless --allow-geocoding is given.
+
+Usage: python -m prediction.server [--port 8765] [--max-batch-size 64] [--max-wait-ms 5] [--allow-geocoding]
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from .batch import (REQUIRED_COLUMNS, DEFAULTS, DEFAULT_WINDOW_DATABASE_PATH, load_window_catalog,
+                    prepare_houses, score_chunk)
+from .cache import PredictionCache
+from .config import MODELS_DIR
+from .pipeline import InferencePipeline
+from .registry import ModelRegistry
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5
+REQUEST_TIMEOUT = 30
+
+NUMERIC_FIELDS = ["floor_area", "stories", *DEFAULTS]
+TEXT_FIELDS = ["zip_code", "vintage", "house_type", "orientation", "baseline", "house_id"]
+# Identifiers that clients commonly send as JSON numbers
+INTEGER_TEXT_FIELDS = ["zip_code", "house_id"]
+
+
+class LatencyStats:
+    """
+    Request latencies (most recent window of requests) and batch counters, thread-safe.
+    """
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.first_request = None
+        self.last_response = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds, status=200):
+        """
+        Record a finished request. 4xx responses (bad input) count as rejected, 5xx as errors.
+        """
+        with self._lock:
+            now = time.perf_counter()
+            if self.first_request is None:
+                self.first_request = now - seconds
+            self.last_response = now
+            self.latencies.append(seconds)
+            self.requests += 1
+            self.rejected += 400 <= status < 500
+            self.errors += status >= 500
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += size
+
+    def summary(self):
+        """
+        Returns:
+        - dict: 'requests', 'rejected' (4xx: input the service could not score), 'errors'
+          (5xx: failures and timeouts of the service itself), 'p50_ms', 'p99_ms', 'throughput_rps' (requests per second
+          between the first request and the latest response), 'batches' and 'mean_batch_size'.
+        """
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            elapsed = self.last_response - self.first_request if self.requests else 0.0
+            p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+            return {"requests": self.requests, "rejected": self.rejected, "errors": self.errors,
+                    "p50_ms": round(float(p50), 2), "p99_ms": round(float(p99), 2),
+                    "throughput_rps": round(self.requests / elapsed, 2) if elapsed > 0 else 0.0,
+                    "batches": self.batches,
+                    "mean_batch_size": round(self.batched_requests / self.batches, 2) if self.batches else 0.0}
+
+
+class MicroBatcher:
+    """
+    Collects submitted items on a background thread and hands them to a scoring function in batches.
+
+    A batch closes when it holds max_batch_size items or max_wait seconds after its
+    first item arrived, whichever comes first.
+    """
+
+    def __init__(self, score_batch, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT_MS / 1000,
+                 stats=None):
+        """
+        Parameters:
+        - score_batch (callable): Takes a list of items, returns one result per item
+          (an Exception instance marks a failed item).
+        - max_batch_size (int): Largest number of items scored together.
+        - max_wait (float): Seconds to wait for more items once a batch has started.
+        - stats (LatencyStats): Receives the size of every batch.
+        """
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = stats
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """
+        Queue an item for scoring.
+
+        Returns:
+        - Future: Resolves to the item's result.
+        """
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._queue.put(None)  # finish this batch, then stop
+                    break
+                batch.append(entry)
+
+            if self.stats is not None:
+                self.stats.record_batch(len(batch))
+            try:
+                results = self.score_batch([item for item, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+class WindowScorer:
+    """
+    Scores batches of house records against the window catalog, as prediction.batch does for a chunk.
+    """
+
+    def __init__(self, windows, pipeline):
+        self.windows = windows
+        self.pipeline = pipeline
+
+    def score_many(self, records):
+        """
+        Rank the catalog's windows for several houses with one model call per target.
+
+        If the batch as a whole fails, each record is scored on its own, so one bad
+        record fails only its own request.
+
+        Parameters:
+        - records (list): House records (dicts), validated by parse_record.
+
+        Returns:
+        - list: Per record, a DataFrame of its ranked windows, a ValueError saying why it was skipped,
+          or the exception that scoring it raised.
+        """
+        try:
+            return self._score(records)
+        except Exception as e:
+            if len(records) == 1:
+                return [e]
+            return [self.score_many([record])[0] for record in records]
+
+    def _score(self, records):
+        houses = prepare_houses(pd.DataFrame.from_records(records), self.windows)
+        results, skipped = score_chunk(houses, self.windows, self.pipeline)
+        by_row = dict(tuple(results.groupby(level="row", sort=False))) if not results.empty else {}
+
+        out = []
+        for i in range(len(records)):
+            if i in skipped:
+                out.append(ValueError(skipped[i]))
+            else:
+                out.append(by_row[i].drop(columns="house_id").reset_index(drop=True))
+        return out
+
+
+def parse_record(body):
+    """
+    Check a request body describing one house.
+
+    Returns:
+    - dict: The record, with numeric fields as floats.
+
+    Raises:
+    - ValueError: If the body is not a JSON object, lacks a required field, or has a field of the wrong type.
+    """
+    try:
+        record = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(record, dict):
+        raise ValueError("Request body must be a JSON object describing one house.")
+    missing = [col for col in REQUIRED_COLUMNS if record.get(col) is None]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    for field in NUMERIC_FIELDS:
+        if record.get(field) is not None:
+            if isinstance(record[field], bool):
+                raise ValueError(f"Field '{field}' must be a number.")
+            try:
+                record[field] = float(record[field])
+            except (TypeError, ValueError):
+                raise ValueError(f"Field '{field}' must be a number.")
+    for field in TEXT_FIELDS:
+        value = record.get(field)
+        if value is None or isinstance(value, str):
+            continue
+        if field in INTEGER_TEXT_FIELDS and isinstance(value, int) and not isinstance(value, bool):
+            record[field] = str(value)
+        else:
+            raise ValueError(f"Field '{field}' must be a string.")
+    return record
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles /score, /stats and /health; the server carries the batcher and stats.
+    """
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.stats.summary())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        start = time.perf_counter()
+        try:
+            record = parse_record(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        else:
+            try:
+                results = self.server.batcher.submit(record).result(timeout=REQUEST_TIMEOUT)
+                status, payload = 200, {"house_id": record.get("house_id"), "results": results.to_dict(orient="records")}
+            except ValueError as e:
+                # The house was read but could not be scored (unknown zip code, vintage, ...)
+                status, payload = 422, {"error": str(e)}
+            except TimeoutError:
+                status, payload = 504, {"error": f"Scoring did not finish within {REQUEST_TIMEOUT} s"}
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+        self._send_json(status, payload)
+        self.server.stats.record(time.perf_counter() - start, status)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the output under load
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections under concurrent load, which clients retry a second later
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, windows_path=DEFAULT_WINDOW_DATABASE_PATH,
+                models_dir=MODELS_DIR, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                allow_unverified=False, allow_geocoding=False):
+    """
+    Build the scoring server (not yet serving).
+
+    Parameters:
+    - allow_unverified (bool): Whether model pickles missing from the manifest may be loaded.
+    - allow_geocoding (bool): Whether to start without a current ZIP atlas, geocoding zip codes while scoring.
+
+    Returns:
+    - ScoringServer: With .batcher, .stats and .pipeline attached; call serve_forever() to start.
+
+    Raises:
+    - FileNotFoundError: If a model is missing, or there is no current ZIP atlas and allow_geocoding is False.
+    """
+    from zipcodeweather import get_default_atlas
+    from zipcodeweather.config import ZIP_ATLAS_PATH
+
+    if get_default_atlas() is None:
+        message = (f"No current ZIP atlas at {ZIP_ATLAS_PATH}, so zip codes would be geocoded on the batching "
+                   f"thread at about one per second, stalling every request batched with them. Build it with "
+                   f"'python -m zipcodeweather.atlas build'")
+        if not allow_geocoding:
+            raise FileNotFoundError(f"{message}, or pass --allow-geocoding.")
+        print(f"Warning: {message}.", file=sys.stderr)
+    registry = ModelRegistry(models_dir, allow_unverified=allow_unverified)
+    pipeline = InferencePipeline.from_registry(registry, cache=PredictionCache())
+    scorer = WindowScorer(load_window_catalog(windows_path), pipeline)
+    server = ScoringServer((host, port), ScoringRequestHandler)
+    server.stats = LatencyStats()
+    server.batcher = MicroBatcher(scorer.score_many, max_batch_size, max_wait_ms / 1000, server.stats)
+    server.pipeline = pipeline
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve window recommendations over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--windows", default=DEFAULT_WINDOW_DATABASE_PATH, help="window catalog CSV")
+    parser.add_argument("--models-dir", default=MODELS_DIR, help="directory holding the models and encoders")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="most requests scored together")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="how long a batch waits for more requests")
+    parser.add_argument("--allow-unverified", action="store_true",
+                        help="load model pickles that are not in the models directory's manifest")
+    parser.add_argument("--allow-geocoding", action="store_true",
+                        help="start without a ZIP atlas, geocoding unknown zip codes while scoring")
+    args = parser.parse_args(argv)
+
+    try:
+        server = make_server(args.host, args.port, args.windows, args.models_dir, args.max_batch_size,
+                             args.max_wait_ms, args.allow_unverified, args.allow_geocoding)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"Serving on http://{args.host}:{args.port} (POST /score, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+        server.pipeline.close()
+        print(json.dumps(server.stats.summary()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,28 +2,44 @@
 
 from zipcodeweather import ZipCodeWeather  # Import the main class from zipcodeweather.py
 from .data_processing import (  # Import functions from data_processing.py
+    weather,
+    LocationContext,
+    resolve_location,
     get_weather_info,
     get_energystar_zone,
     calculate_predicted_window_area,
     calculate_surface_volume_ratio,
     convert_orientation,
     calculate_period,
+    calculate_predicted_window_areas,
+    calculate_surface_volume_ratios,
+    convert_orientations,
+    calculate_periods,
     get_floor_area_bin,
+    get_floor_area_bins,
+    InfiltrationIndex,
+    get_infiltration_index,
     get_infiltration
 )
 
-# Initialize ZipCodeWeather instance
-weather = ZipCodeWeather()
-
 # Define __all__ to specify public objects of the module
 __all__ = [
     "ZipCodeWeather",
+    "LocationContext",
+    "resolve_location",
     "get_weather_info",
     "get_energystar_zone",
     "calculate_predicted_window_area",
     "calculate_surface_volume_ratio",
     "convert_orientation",
     "calculate_period",
+    "calculate_predicted_window_areas",
+    "calculate_surface_volume_ratios",
+    "convert_orientations",
+    "calculate_periods",
     "get_floor_area_bin",
+    "get_floor_area_bins",
+    "InfiltrationIndex",
+    "get_infiltration_index",
     "get_infiltration"
 ]
\ No newline at end of file
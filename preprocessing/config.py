@@ -0,0 +1,9 @@
+# config.py
+
+import os
+
+# Base directory of the package
+BASE_DIR = os.path.dirname(__file__)
+
+# Paths to data files
+INFILTRATION_PATH = os.path.join(BASE_DIR, '../data/Infiltration.tsv')
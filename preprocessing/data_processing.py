@@ -2,30 +2,111 @@
 # Weather data processing
 #%%
 from zipcodeweather import *
+from zipcodeutility import get_zip_attributes
+from shared import load_once
+from .config import INFILTRATION_PATH
+from functools import lru_cache
 import pandas as pd
 
+# Shares the process-wide station and climate zone tables; nothing is read until first use
 weather = ZipCodeWeather()
 
-def get_weather_info(zip_code):
+class LocationContext:
+    """
+    Everything the tool needs to know about a zip code, resolved once.
+
+    Holds the coordinates, nearest weather station, BA/IECC climate zones,
+    ENERGY STAR zone and state of a zip code so that the preprocessing
+    functions and pages share one resolution instead of geocoding repeatedly.
+    """
+
+    def __init__(self, zip_code, coordinates, station, climate_zone, energystar_zone, state):
+        self.zip_code = zip_code
+        self.coordinates = coordinates
+        self.station = station
+        self.climate_zone = climate_zone
+        self.energystar_zone = energystar_zone
+        self.state = state
+
+    @property
+    def ba_climate_zone(self):
+        return self.climate_zone["BA_Climate_Zone"]
+
+    @property
+    def iecc_climate_zone(self):
+        return self.climate_zone["ASHRAE_IECC_Climate_Zone"]
+
+    def __repr__(self):
+        return (f"LocationContext(zip_code={self.zip_code!r}, coordinates={self.coordinates}, "
+                f"station={self.station.get('Location')!r}, climate_zone={self.climate_zone}, "
+                f"energystar_zone={self.energystar_zone!r}, state={self.state!r})")
+
+
+@lru_cache(maxsize=1024)
+def _resolve_location(zip_code):
+    atlas = get_default_atlas()
+    try:
+        # Prebuilt ZIP atlas: one indexed read instead of geocoding and spatial queries
+        entry = atlas.lookup(zip_code) if atlas is not None else None
+    except ValueError:
+        entry = None
+
+    if entry is not None:
+        coordinates = entry["coordinates"]
+        station = weather.weather_stations.iloc[entry["station_index"]].to_dict()
+        climate_zone = entry["climate_zone"]
+    else:
+        coordinates = get_coordinates(zip_code)
+        station = weather.get_nearest_station(zip_code, user_coords=coordinates)
+        climate_zone = weather.get_climate_zone(zip_code, user_coords=coordinates)
+    if station is None or climate_zone is None:
+        raise ValueError(f"Could not resolve weather station or climate zone for zip code {zip_code}")
+    try:
+        attributes = get_zip_attributes(zip_code)
+    except ValueError:
+        # Coordinates resolved but the zip code is missing from ClimateZones_County.csv
+        attributes = {"energystar_zone": None, "state": None}
+    return LocationContext(zip_code, coordinates, station, climate_zone,
+                           attributes["energystar_zone"], attributes["state"])
+
+
+def resolve_location(location):
+    """
+    Resolve a zip code to a LocationContext (memoized per zip code).
+
+    Parameters:
+    - location (str or LocationContext): Zip code of the location, or an already resolved context.
+
+    Returns:
+    - LocationContext: The resolved location.
+    """
+    if isinstance(location, LocationContext):
+        return location
+    return _resolve_location(str(location).strip())
+
+
+def get_weather_info(location):
     """
     Retrieve weather station and climate zone information for a given zip code.
 
     Parameters:
-    - zip_code (str): Zip code of the location.
+    - location (str or LocationContext): Zip code of the location, or its resolved context.
 
     Returns:
     - pd.DataFrame: A DataFrame containing zip code, coordinates, nearest weather station info, and climate zone.
     """
     try:
-        # Step 1: Find nearest weather station (returns a Series)
-        nearest_station = weather.get_nearest_station(zip_code)
+        location = resolve_location(location)
+
+        # Step 1: Nearest weather station (a dict of station attributes)
+        nearest_station = location.station
 
         # Step 2: Retrieve the climate zone as a string
-        ba_climate_zone = weather.get_climate_zone(zip_code)["BA_Climate_Zone"]
+        ba_climate_zone = location.ba_climate_zone
 
         # Step 3: Combine all data into a DataFrame
         data = {
-            "Zip Code": [zip_code],
+            "Zip Code": [location.zip_code],
             "winter_avg_temp": nearest_station['winter_avg_temp'],
             "summer_avg_temp": nearest_station['summer_avg_temp'],
             "Climate Zone": [ba_climate_zone],
@@ -52,11 +133,12 @@ if __name__ == "__main__":
     print(df)
 
 #%%
-def get_energystar_zone(zip_code):
+def get_energystar_zone(location):
     try:
-        df = pd.read_csv('data/ClimateZones_County.csv')
-        energystar_zone = df.loc[df['Zip Code'] == int(zip_code), 'ENERGY STAR Zone'].values[0]
-        return energystar_zone
+        if isinstance(location, LocationContext):
+            return location.energystar_zone
+        # A bare zip code only needs the ZIP attribute index, not a full location resolution
+        return get_zip_attributes(location)["energystar_zone"]
 
     except ValueError as e:
         print(f"Error: {e}")
@@ -174,6 +256,104 @@ def calculate_period(HDD, CDD):
     cooling_period = CDD/(HDD+CDD)*12
     return heating_period, cooling_period
 
+#%%
+# Array versions of the geometry functions above, for columns of houses.
+# Each one follows the scalar arithmetic step by step so results match exactly;
+# rows the scalar version returns None for come out as NaN.
+
+# Footprint aspect ratio by building type (the constants in the scalar branches)
+BUILDING_ASPECT_RATIOS = {
+    'Single-Family Detached': 1.8,
+    'Single-Family Attached': 0.5556,
+    'Apartment Unit': 0.5556,
+    'Mobile Home': 1.8,
+}
+SINGLE_FAMILY_TYPES = ['Single-Family Detached', 'Single-Family Attached']
+
+ORIENTATION_LABELS = ['North', 'Northeast', 'East', 'Southeast', 'South', 'Southwest', 'West', 'Northwest']
+ORIENTATION_DEGREES = np.array([0, 45, 90, 135, 180, 225, 270, 315], dtype=float)
+
+def _building_geometry(conditioned_area, building_type, stories, foundation):
+    """
+    Per-row footprint area, perimeter and floor count shared by the array geometry functions.
+
+    Returns:
+    - tuple: (foundation_area, perimeter c, floors above the foundation incl. a heated
+      basement, stories used for the window area); all NaN for unknown building types.
+    """
+    conditioned_area = np.asarray(conditioned_area, dtype=float)
+    building_type = np.asarray(building_type, dtype=object)
+    stories = np.asarray(stories, dtype=float)
+    foundation = np.asarray(foundation, dtype=object)
+
+    ratio = pd.Series(building_type).map(BUILDING_ASPECT_RATIOS).to_numpy(dtype=float)
+    single_family = np.isin(building_type, SINGLE_FAMILY_TYPES)
+    heated_basement = single_family & (foundation == 'Heated Basement')
+
+    # Apartments and mobile homes are a single floor regardless of 'stories'
+    window_stories = np.where(single_family, stories, 1.0)
+    floors = np.where(heated_basement, stories + 1, window_stories)
+
+    foundation_area = conditioned_area / floors
+    solution = np.sqrt(foundation_area / ratio)
+    c = (solution + solution * ratio) * 2
+    return foundation_area, c, floors, window_stories
+
+def calculate_predicted_window_areas(conditioned_area, building_type, stories, wwr, foundation):
+    """
+    Vectorized calculate_predicted_window_area.
+
+    Parameters:
+    - conditioned_area, stories, wwr (array-like): Numeric columns, one value per house.
+    - building_type, foundation (array-like): String columns, one value per house.
+
+    Returns:
+    - np.ndarray: Predicted window area per house.
+    """
+    _, c, _, window_stories = _building_geometry(conditioned_area, building_type, stories, foundation)
+    return c * 8 * window_stories * (np.asarray(wwr, dtype=float) * 0.01)
+
+def calculate_surface_volume_ratios(conditioned_area, building_type, stories, foundation):
+    """
+    Vectorized calculate_surface_volume_ratio.
+
+    Parameters:
+    - conditioned_area, stories (array-like): Numeric columns, one value per house.
+    - building_type, foundation (array-like): String columns, one value per house.
+
+    Returns:
+    - np.ndarray: Surface area to volume ratio per house.
+    """
+    foundation_area, c, floors, _ = _building_geometry(conditioned_area, building_type, stories, foundation)
+    volume = foundation_area * floors * 8
+    surface_area = c * floors * 8 + foundation_area
+    return surface_area / volume
+
+def convert_orientations(orientations):
+    """
+    Vectorized convert_orientation.
+
+    Parameters:
+    - orientations (array-like): Orientation names, e.g. 'Southwest'.
+
+    Returns:
+    - np.ndarray: Azimuth in degrees per orientation.
+    """
+    codes = pd.Index(ORIENTATION_LABELS).get_indexer(np.asarray(orientations, dtype=object))
+    return np.where(codes >= 0, ORIENTATION_DEGREES[codes], np.nan)
+
+def calculate_periods(HDD, CDD):
+    """
+    Vectorized calculate_period.
+
+    Parameters:
+    - HDD, CDD (array-like): Heating and cooling degree days.
+
+    Returns:
+    - tuple: (heating_period, cooling_period) arrays in months.
+    """
+    return calculate_period(np.asarray(HDD, dtype=float), np.asarray(CDD, dtype=float))
+
 #%%
 def get_floor_area_bin(floor_area):
     bins = ['0-499', '1000-1499', '1500-1999', '2000-2499', '2500-2999',
@@ -189,20 +369,99 @@ def get_floor_area_bin(floor_area):
                 return bin_label
     return None  # or raise an error if not matched
 
-def get_infiltration(zip_code, floor_area, vintage):
+# Numeric edges of the floor-area bins, in ascending order
+FLOOR_AREA_BIN_LABELS = np.array(['0-499', '500-749', '750-999', '1000-1499', '1500-1999',
+                                  '2000-2499', '2500-2999', '3000-3999', '4000+'], dtype=object)
+FLOOR_AREA_BIN_LOWER = np.array([0, 500, 750, 1000, 1500, 2000, 2500, 3000, 4000], dtype=float)
+FLOOR_AREA_BIN_UPPER = np.array([499, 749, 999, 1499, 1999, 2499, 2999, 3999, np.inf], dtype=float)
+
+def get_floor_area_bins(floor_areas):
+    """
+    Vectorized get_floor_area_bin.
+
+    Parameters:
+    - floor_areas (array-like): Floor areas in sq ft.
+
+    Returns:
+    - np.ndarray: Bin label per floor area, None where get_floor_area_bin returns None.
+    """
+    floor_areas = np.asarray(floor_areas, dtype=float)
+    bins = np.searchsorted(FLOOR_AREA_BIN_LOWER, floor_areas, side='right') - 1
+    # Inclusive upper bounds leave gaps (e.g. 499.5) that the scalar version does not match
+    valid = (bins >= 0) & (floor_areas <= FLOOR_AREA_BIN_UPPER[np.clip(bins, 0, None)])
+    return np.where(valid, FLOOR_AREA_BIN_LABELS[np.clip(bins, 0, None)], None)
+
+class InfiltrationIndex:
+    """
+    Infiltration.tsv keyed by (IECC zone, floor-area bin, vintage).
+
+    Each key maps to a row of the ACH50 option probability matrix, so a lookup
+    is a dict access instead of a three-column boolean mask over the file.
+    """
+
+    def __init__(self, infiltration_df):
+        self.options = np.array([col for col in infiltration_df.columns
+                                 if 'Option=' in col and 'ACH50' in col], dtype=object)
+        self.probabilities = infiltration_df[list(self.options)].to_numpy(dtype=float)
+        keys = zip(infiltration_df['IECC Zone'], infiltration_df['Geometry Floor Area'], infiltration_df['Vintage'])
+        self.rows = {}
+        for row, key in enumerate(keys):
+            # Keep the first matching row, as the original filter did
+            self.rows.setdefault(key, row)
+
+    def lookup(self, iecc_zone, floor_area_bin, vintage, distribution=False):
+        """
+        Infiltration level of one house.
+
+        Parameters:
+        - iecc_zone (str): ASHRAE IECC climate zone, e.g. '5A'.
+        - floor_area_bin (str): Floor-area bin label, e.g. '2000-2499'.
+        - vintage (str): Vintage, e.g. '1940s'.
+        - distribution (bool): Return the full option probability vector instead of the most likely option.
+
+        Returns:
+        - str or pd.Series: Most likely option label (e.g. 'Option=15 ACH50'), or probabilities indexed by option.
+        """
+        row = self.rows.get((iecc_zone, floor_area_bin, vintage))
+        if row is None:
+            raise ValueError(f"No infiltration data for zone {iecc_zone}, floor area {floor_area_bin}, vintage {vintage}")
+        if distribution:
+            return pd.Series(self.probabilities[row], index=self.options)
+        return self.options[np.argmax(self.probabilities[row])]
+
+    def lookup_many(self, iecc_zones, floor_areas, vintages, distribution=False):
+        """
+        Vectorized lookup for many houses.
+
+        Parameters:
+        - iecc_zones, floor_areas, vintages (array-like): One entry per house; floor areas in sq ft.
+        - distribution (bool): Return the probability matrix instead of the most likely options.
+
+        Returns:
+        - np.ndarray: Option labels (None where no data matches), or an (n_houses, n_options)
+          probability matrix with NaN rows where no data matches.
+        """
+        bins = get_floor_area_bins(floor_areas)
+        rows = np.array([self.rows.get(key, -1) for key in zip(iecc_zones, bins, vintages)], dtype=np.int64)
+        found = rows >= 0
+        probabilities = np.where(found[:, None], self.probabilities[np.where(found, rows, 0)], np.nan)
+        if distribution:
+            return probabilities
+        best = np.argmax(np.nan_to_num(probabilities, nan=-1.0), axis=1)
+        return np.where(found, self.options[best], None)
+
+@load_once
+def get_infiltration_index():
+    """
+    The InfiltrationIndex for data/Infiltration.tsv, built on first use.
+    """
+    return InfiltrationIndex(pd.read_csv(INFILTRATION_PATH, sep='\t'))
+
+def get_infiltration(location, floor_area, vintage, distribution=False):
     try:
-        df = pd.read_csv('data/Infiltration.tsv', sep='\t')
         floor_area_bin = get_floor_area_bin(floor_area)
-        iecc_zone = weather.get_climate_zone(zip_code)["ASHRAE_IECC_Climate_Zone"]
-        matched_row = df[
-            (df['IECC Zone'] == iecc_zone) &
-            (df['Geometry Floor Area'] == floor_area_bin) &
-            (df['Vintage'] == vintage)
-            ]
-        ach_columns = [col for col in df.columns if 'Option=' in col and 'ACH50' in col]
-        row = matched_row.iloc[0][ach_columns].astype(float)
-        infiltration = row.idxmax()
-        return infiltration
+        iecc_zone = resolve_location(location).iecc_climate_zone
+        return get_infiltration_index().lookup(iecc_zone, floor_area_bin, vintage, distribution=distribution)
 
     except ValueError as e:
         print(f"Error: {e}")
@@ -218,7 +477,8 @@ if __name__ == "__main__":
 #%%
 from zipcodeutility import ZipCodeUtility
 
-utility = ZipCodeUtility()
-rates = utility.get_rates("16803", "Natural Gas")
-
-print(rates)
+# Example usage
+if __name__ == "__main__":
+    utility = ZipCodeUtility()
+    rates = utility.get_rates("16803", "Natural Gas")
+    print(rates)
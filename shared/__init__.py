@@ -0,0 +1,11 @@
+# __init__.py
+
+from .loading import load_once  # Import the lazy reference loader from loading.py
+from .zipcodes import ZIP_SPACE, parse_zip  # Import the ZIP code parser from zipcodes.py
+
+# Define __all__ to specify public objects of the module
+__all__ = [
+    "load_once",
+    "ZIP_SPACE",
+    "parse_zip"
+]
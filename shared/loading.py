@@ -0,0 +1,26 @@
+# loading.py
+
+import functools
+import threading
+
+
+def load_once(loader):
+    """
+    Decorator: run a zero-argument loader on first call and share its result process-wide.
+
+    Streamlit serves sessions from several threads, so the first call is guarded
+    by a lock to make sure the table is read only once.
+    """
+    lock = threading.Lock()
+    result = []
+
+    @functools.wraps(loader)
+    def wrapper():
+        if not result:
+            with lock:
+                if not result:
+                    result.append(loader())
+        return result[0]
+
+    wrapper.is_loaded = lambda: bool(result)
+    return wrapper
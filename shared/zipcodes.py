@@ -0,0 +1,20 @@
+# zipcodes.py
+
+# Five-digit ZIP codes fit in a dense array of this size
+ZIP_SPACE = 100000
+
+
+def parse_zip(zip_code):
+    """
+    Convert a zip code to its integer form.
+
+    Parameters:
+    - zip_code (str or int): U.S. ZIP code, optionally in ZIP+4 form (e.g. '16803-1234').
+
+    Returns:
+    - int: The five-digit ZIP as an integer.
+    """
+    zip_str = str(zip_code).strip().split("-")[0]
+    if not zip_str.isdigit() or len(zip_str) > 5:
+        raise ValueError(f"Invalid zip code {zip_code}")
+    return int(zip_str)
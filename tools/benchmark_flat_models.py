@@ -0,0 +1,65 @@
+# benchmark_flat_models.py
+"""
+Compare the flattened NumPy tree evaluator with LightGBM's predict.
+
+For every target with a LightGBM model in models/, the ensemble is flattened
+and both evaluators score the same random batches at several sizes. Reports
+the largest absolute difference and the median time per call.
+
+Usage: python tools/benchmark_flat_models.py   (from the repository root)
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from prediction import FlatEnsemble, get_default_registry  # noqa: E402
+
+BATCH_SIZES = [1, 13, 32, 64, 100, 200, 1000, 10000]
+REPEATS = 7
+
+
+def random_inputs(model, n_rows, seed=0):
+    """
+    Random rows spanning the value range each feature was split on during training.
+    """
+    infos = model.booster_.dump_model(num_iteration=1)["feature_infos"] if hasattr(model, "booster_") \
+        else model.dump_model(num_iteration=1)["feature_infos"]
+    rng = np.random.default_rng(seed)
+    columns = [rng.uniform(info["min_value"], info["max_value"], n_rows) for info in infos.values()]
+    return np.column_stack(columns)
+
+
+def median_time(fn, X):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def main():
+    registry = get_default_registry()
+    failed = False
+    for target, name in registry.discover().items():
+        model = registry.artifact(name)["model"]
+        if isinstance(model, FlatEnsemble):
+            continue
+        flat = FlatEnsemble.from_model(model)
+        print(f"{target} ({name}: {len(flat.roots)} trees, depth {flat.max_depth})")
+        for n_rows in BATCH_SIZES:
+            X = random_inputs(model, n_rows)
+            diff = float(np.abs(flat.predict(X) - model.predict(X)).max())
+            failed |= diff > 1e-8
+            lgb_ms, flat_ms = median_time(model.predict, X), median_time(flat.predict, X)
+            print(f"  {n_rows:6d} rows  lightgbm {lgb_ms:9.2f} ms  flat {flat_ms:9.2f} ms"
+                  f"  x{lgb_ms / flat_ms:5.1f}  max abs diff {diff:.2e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
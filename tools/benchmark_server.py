@@ -0,0 +1,66 @@
+# benchmark_server.py
+"""
+Load-test a running scoring service (python -m prediction.server).
+
+Sends the same house from several concurrent clients, varying the floor area
+so the prediction cache cannot answer every request, and reports the latency
+percentiles and throughput seen by the clients next to the server's /stats.
+
+The figures quoted when the server was added came from a models directory in
+which cooling_load_lightgbm.pkl was a copy of the heating_load model (the tree
+ships no cooling_load LightGBM model), with location lookup stubbed out.
+
+Usage: python tools/benchmark_server.py [--url http://127.0.0.1:8765] [--requests 500] [--concurrency 16]
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+HOUSE = {"zip_code": "94103", "vintage": "1980s", "house_type": "Single-Family Detached", "orientation": "South",
+         "stories": 2, "summer_bill": 120, "winter_bill": 90}
+
+
+def post_house(url, floor_area):
+    body = json.dumps({**HOUSE, "floor_area": floor_area}).encode()
+    request = urllib.request.Request(url + "/score", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            ok = response.status == 200
+    except urllib.error.HTTPError:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    floor_areas = 1000 + np.arange(args.requests) % 2000
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(lambda area: post_house(args.url, int(area)), floor_areas))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([seconds for seconds, _ in outcomes]) * 1000
+    failures = sum(not ok for _, ok in outcomes)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"client  {args.requests} requests, concurrency {args.concurrency}, {failures} failed")
+    print(f"client  p50 {p50:.1f} ms  p99 {p99:.1f} ms  throughput {args.requests / elapsed:.1f} req/s")
+    with urllib.request.urlopen(args.url + "/stats") as response:
+        print(f"server  {json.loads(response.read())}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# check_async_geocoding.py
+"""
+Exercise get_coordinates_many against a local stand-in for Nominatim.
+
+A stub http.server answers the search endpoint: known zip codes get
+coordinates, '00000' gets an empty result (not found), '99999' gets an
+HTTP 500 and '88888' a body that is not JSON. The check confirms that
+results come back in input order, that failures map to None, that
+duplicates are requested once and that requests are spaced by the rate limit.
+
+Usage: python tools/check_async_geocoding.py   (from the repository root)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from zipcodeweather import get_coordinates_many  # noqa: E402
+
+KNOWN = {"94103": (37.77, -122.41), "10001": (40.75, -73.99), "60601": (41.88, -87.62)}
+REQUESTS_PER_SECOND = 20
+
+
+class StubNominatim(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        zip_code = parse_qs(urlparse(self.path).query)["postalcode"][0]
+        StubNominatim.requests.append((zip_code, time.monotonic()))
+        if zip_code == "99999":
+            self.send_response(500)
+            self.end_headers()
+            return
+        if zip_code == "88888":
+            body = b"<html>rate limited</html>"
+        elif zip_code in KNOWN:
+            lat, lon = KNOWN[zip_code]
+            body = json.dumps([{"lat": str(lat), "lon": str(lon)}]).encode()
+        else:
+            body = b"[]"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNominatim)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/search"
+
+    zip_codes = ["94103", "10001", "00000", "99999", "94103", "88888", "60601"]
+    try:
+        results = get_coordinates_many(zip_codes, base_url=base_url, use_local=False, allow_remote=True,
+                                       requests_per_second=REQUESTS_PER_SECOND)
+    finally:
+        server.shutdown()
+
+    failures = []
+    expected = [KNOWN.get(z) for z in zip_codes]
+    if results != expected:
+        failures.append(f"results {results} != expected {expected}")
+    requested = [z for z, _ in StubNominatim.requests]
+    if sorted(requested) != sorted(set(zip_codes)):
+        failures.append(f"requested {requested}, expected each distinct zip code once")
+    starts = sorted(t for _, t in StubNominatim.requests)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    # Allow a little scheduling jitter below the nominal interval
+    if gaps and min(gaps) < 0.8 / REQUESTS_PER_SECOND:
+        failures.append(f"requests {min(gaps) * 1000:.1f} ms apart, limit is {1000 / REQUESTS_PER_SECOND:.0f} ms")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print(f"ok   {len(zip_codes)} zip codes, {len(requested)} requests, "
+              f"min gap {min(gaps) * 1000:.1f} ms (limit {1000 / REQUESTS_PER_SECOND:.0f} ms)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# import_budget.py
+"""
+Check the import cost of each Streamlit page against a budget.
+
+For every page the top-level imports are read from the source and imported in a
+fresh interpreter with `-X importtime`, after streamlit itself (which the server
+has already loaded). The page fails if its imports take longer than its budget
+or pull in a heavy module it should not need.
+
+Usage: python tools/import_budget.py   (from the repository root)
+"""
+
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Cumulative import time budget per page, in milliseconds
+BUDGETS_MS = {
+    "Home.py": 200,
+    "pages/1_House_Location.py": 800,
+    "pages/2_House_Information.py": 800,
+    "pages/3_Window_Information.py": 800,
+    "pages/4_Results.py": 1000,
+}
+
+# Modules that must only be imported on the code paths that use them
+HEAVY_MODULES = ["geopandas", "shapely", "geopy", "requests", "aiohttp", "matplotlib", "lightgbm", "category_encoders"]
+
+
+def page_imports(path):
+    """
+    Top-level modules imported by a page script.
+    """
+    with open(os.path.join(ROOT, path)) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return [m for m in dict.fromkeys(modules) if m != "streamlit"]
+
+
+def measure(modules):
+    """
+    Import the modules after streamlit in a fresh interpreter.
+
+    Returns:
+    - tuple: (cumulative import time in ms, heavy modules that ended up imported)
+    """
+    code = ("import streamlit, sys\n"
+            + "".join(f"import {m}\n" for m in modules)
+            + f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only count the page's own top-level imports; nested entries are already included
+        if name.strip() in modules and not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    # The heavy-module report is the last line printed; pages' modules may print too
+    lines = result.stdout.splitlines()
+    heavy = [m for m in lines[-1].split(",") if m] if lines else []
+    return total_us / 1000, heavy
+
+
+def main():
+    failed = False
+    for page, budget in BUDGETS_MS.items():
+        modules = page_imports(page)
+        elapsed, heavy = measure(modules)
+        ok = elapsed <= budget and not heavy
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {page:32s} {elapsed:7.1f} ms / {budget} ms"
+              + (f"  heavy: {', '.join(heavy)}" if heavy else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 # File: utils.py
 
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
 
 # Navigation button functions
@@ -46,6 +45,9 @@ def Go_to_Result():
         st.switch_page("pages/4_Results.py")
 
 def plot_energy_contributions(df):
+    # matplotlib is only needed on the Results page; import it there rather than on every page
+    import matplotlib.pyplot as plt
+
     # Prepare data for the plot
     window_names = df["window_name"]
     # Truncate window names for display
@@ -121,6 +123,8 @@ def plot_energy_contributions_pie(df):
 
     If cooling_load or heating_load is less than 5, the corresponding pie chart is not plotted.
     """
+    import matplotlib.pyplot as plt
+
     # Obtain total loads (assumed constant across rows)
     window_name = df["window_name"]
     cooling_total = df["cooling_load"]
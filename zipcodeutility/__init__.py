@@ -1,10 +1,15 @@
-from .zipcode_state import get_state_from_zip
-from .utilityrates import ZipCodeUtility
+from .zipcode_state import get_state_from_zip, get_zip_attributes, get_zip_index, ZipIndex
+from .utilityrates import ZipCodeUtility, RateTable, get_default_rate_table
 from .config import UTILITY_RATES_PATH, ZIPCODE_STATE_PATH
 
 __all__ = [
     "ZipCodeUtility",
+    "RateTable",
+    "get_default_rate_table",
     "get_state_from_zip",
+    "get_zip_attributes",
+    "get_zip_index",
+    "ZipIndex",
     "UTILITY_RATES_PATH",
     "ZIPCODE_STATE_PATH"
 ]
\ No newline at end of file
@@ -1,15 +1,80 @@
+import numpy as np
 import pandas as pd
-from .zipcode_state import get_state_from_zip
+from shared import load_once
+from .zipcode_state import get_state_from_zip, get_zip_index
 from .config import UTILITY_RATES_PATH
 
+# Electricity rates are published in cents/kWh; the tool works in $/MMBtu-equivalent units
+ELECTRICITY_CONVERSION = 0.01/0.003413
+
+
+class RateTable:
+    """
+    Immutable state-indexed utility rate table.
+
+    Rates are held in a read-only matrix (one row per state, one column per
+    fuel) with electricity already converted, so lookups are array reads
+    instead of per-call pandas filtering.
+    """
+
+    def __init__(self, rates_df):
+        """
+        Build the table. The given DataFrame is not modified.
+
+        Parameters:
+        - rates_df (pd.DataFrame): 'State' column plus one column of rates per fuel.
+        """
+        fuels = [col for col in rates_df.columns if col != "State" and not col.startswith("Unnamed")]
+        rates = rates_df[fuels].to_numpy(dtype=float, copy=True)
+        rates[:, fuels.index("Electricity")] *= ELECTRICITY_CONVERSION
+        rates.setflags(write=False)
+
+        self.fuels = tuple(fuels)
+        self.rates = rates
+        states = rates_df["State"].str.upper()
+        # First row wins for duplicate states, matching the original filter
+        self.state_rows = {state: row for row, state in reversed(list(enumerate(states)))}
+        self._fuel_cols = {fuel: col for col, fuel in enumerate(fuels)}
+
+    def fuel_column(self, fuel_type):
+        """
+        Column of a fuel type in the rate matrix (fuel names are matched in title case).
+        """
+        fuel = fuel_type.title()  # Capitalize to match dataset columns
+        if fuel not in self._fuel_cols:
+            raise KeyError(f"Fuel type '{fuel_type}' not found in dataset.")
+        return self._fuel_cols[fuel]
+
+    def to_frame(self):
+        """
+        The converted rates as a new DataFrame (changes to it do not affect the table).
+        """
+        states = sorted(self.state_rows, key=self.state_rows.get)
+        df = pd.DataFrame(self.rates[[self.state_rows[s] for s in states]], columns=list(self.fuels))
+        df.insert(0, "State", states)
+        return df
+
+
+@load_once
+def get_default_rate_table():
+    """
+    The RateTable for UtilityRates_States.csv, built once per process.
+    """
+    return RateTable(pd.read_csv(UTILITY_RATES_PATH))
+
+
 class ZipCodeUtility:
     """
     A class to get electricity and heating fuel rates by zip code and fuel type.
     """
 
     def __init__(self, rates_df=None):
-        self.rates_df = rates_df or pd.read_csv(UTILITY_RATES_PATH)
-        self.rates_df["Electricity"] = self.rates_df["Electricity"]*0.01/0.003413
+        self.table = get_default_rate_table() if rates_df is None else RateTable(rates_df)
+
+    @property
+    def rates_df(self):
+        # Converted rates as a DataFrame, for callers that inspect the table directly
+        return self.table.to_frame()
 
     def get_rates(self, zip_code, fuel_type):
         """
@@ -25,16 +90,16 @@ class ZipCodeUtility:
         """
         try:
             state = get_state_from_zip(zip_code).upper()
-            fuel = fuel_type.title()  # Capitalize to match dataset columns
 
-            if fuel not in self.rates_df.columns:
+            try:
+                fuel_col = self.table.fuel_column(fuel_type)
+            except KeyError:
                 return {"error": f"Fuel type '{fuel_type}' not found in dataset."}
 
-            match = self.rates_df[self.rates_df["State"].str.upper() == state]
-
-            if not match.empty:
-                electricity_rate = float(match["Electricity"].values[0])
-                heating_fuel_rate = float(match[fuel].values[0])
+            row = self.table.state_rows.get(state)
+            if row is not None:
+                electricity_rate = float(self.table.rates[row, self.table.fuel_column("Electricity")])
+                heating_fuel_rate = float(self.table.rates[row, fuel_col])
                 return {
                     "electricity_rate": electricity_rate,
                     "heating_fuel_rate": heating_fuel_rate
@@ -42,4 +107,38 @@ class ZipCodeUtility:
             else:
                 return {"error": f"No data found for state '{state}'."}
         except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    def get_rates_many(self, zip_codes, fuel_types):
+        """
+        Electricity and heating fuel rates for many zip codes at once.
+
+        Parameters:
+        - zip_codes (array-like): ZIP codes as strings or integers.
+        - fuel_types (str or array-like): One fuel type for all rows, or one per zip code.
+
+        Returns:
+        - pd.DataFrame: 'state', 'electricity_rate' and 'heating_fuel_rate' per zip code;
+          rates are NaN where the zip code, state or fuel type is unknown.
+        """
+        states = get_zip_index().lookup_many(zip_codes)["state"].to_numpy(dtype=object)
+        rows = np.array([self.table.state_rows.get(s, -1) for s in states], dtype=np.int64)
+
+        if isinstance(fuel_types, str):
+            fuel_types = [fuel_types] * len(rows)
+        fuel_cols = {}
+        for fuel in set(fuel_types):
+            try:
+                fuel_cols[fuel] = self.table.fuel_column(fuel)
+            except KeyError:
+                fuel_cols[fuel] = -1
+        cols = np.array([fuel_cols[f] for f in fuel_types], dtype=np.int64)
+
+        safe_rows = np.where(rows >= 0, rows, 0)
+        electricity = np.where(rows >= 0, self.table.rates[safe_rows, self.table.fuel_column("Electricity")], np.nan)
+        fuel = np.where((rows >= 0) & (cols >= 0), self.table.rates[safe_rows, np.where(cols >= 0, cols, 0)], np.nan)
+        return pd.DataFrame({
+            "state": states,
+            "electricity_rate": electricity,
+            "heating_fuel_rate": fuel
+        })
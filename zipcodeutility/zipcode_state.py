@@ -1,9 +1,117 @@
+import numpy as np
 import pandas as pd
+from shared import ZIP_SPACE, load_once, parse_zip
 from .config import ZIPCODE_STATE_PATH
 
-# Load once at module level
-zipcode_df = pd.read_csv(ZIPCODE_STATE_PATH)
-zipcode_df["Zip Code"] = zipcode_df["Zip Code"].astype(str)
+
+@load_once
+def get_zipcode_df():
+    """
+    The ZIP code table from ClimateZones_County.csv, loaded once on first use.
+    """
+    df = pd.read_csv(ZIPCODE_STATE_PATH)
+    df["Zip Code"] = df["Zip Code"].astype(str)
+    return df
+
+
+def __getattr__(name):
+    # Kept for callers that used the former module-level table
+    if name == "zipcode_df":
+        return get_zipcode_df()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ZipIndex:
+    """
+    Loaded-once ZIP attribute index.
+
+    A dense array maps every integer ZIP to its row, and the attributes are
+    stored column-wise, so a lookup is two array reads instead of a scan of the
+    41k-row table.
+    """
+
+    def __init__(self, zipcode_df):
+        """
+        Build the index.
+
+        Parameters:
+        - zipcode_df (pd.DataFrame): Table with 'Zip Code', 'State Abbrev.', 'Primary County',
+          'FIPS Code' and 'ENERGY STAR Zone' columns.
+        """
+        zips = zipcode_df["Zip Code"].astype(int).to_numpy()
+        self.row_of = np.full(ZIP_SPACE, -1, dtype=np.int32)
+        # Keep the first row for a ZIP, as the original table scan did
+        self.row_of[zips[::-1]] = np.arange(len(zips), dtype=np.int32)[::-1]
+
+        self.state = zipcode_df["State Abbrev."].str.upper().to_numpy(dtype=object)
+        self.county = zipcode_df["Primary County"].to_numpy(dtype=object)
+        self.fips = np.array([f"{int(f):05d}" for f in zipcode_df["FIPS Code"]], dtype=object)
+        self.energystar_zone = zipcode_df["ENERGY STAR Zone"].to_numpy(dtype=object)
+
+    def _rows(self, zip_codes):
+        zips = np.array([_parse_zip(z) for z in zip_codes], dtype=np.int64)
+        in_range = (zips >= 0) & (zips < ZIP_SPACE)
+        rows = np.full(len(zips), -1, dtype=np.int64)
+        rows[in_range] = self.row_of[zips[in_range]]
+        return rows
+
+    def lookup(self, zip_code):
+        """
+        Attributes of a single zip code.
+
+        Parameters:
+        - zip_code (str or int): U.S. ZIP code
+
+        Returns:
+        - dict: 'state', 'county', 'fips' and 'energystar_zone' of the zip code.
+        """
+        row = self._rows([zip_code])[0]
+        if row < 0:
+            raise ValueError(f"Could not find zip code {zip_code}")
+        return {
+            "state": self.state[row],
+            "county": self.county[row],
+            "fips": self.fips[row],
+            "energystar_zone": self.energystar_zone[row]
+        }
+
+    def lookup_many(self, zip_codes):
+        """
+        Vectorized lookup for an array of zip codes.
+
+        Parameters:
+        - zip_codes (array-like): ZIP codes as strings or integers.
+
+        Returns:
+        - pd.DataFrame: 'state', 'county', 'fips', 'energystar_zone' and a boolean 'found'
+          column, one row per input zip code.
+        """
+        rows = self._rows(zip_codes)
+        found = rows >= 0
+        safe = np.where(found, rows, 0)
+        return pd.DataFrame({
+            "state": np.where(found, self.state[safe], None),
+            "county": np.where(found, self.county[safe], None),
+            "fips": np.where(found, self.fips[safe], None),
+            "energystar_zone": np.where(found, self.energystar_zone[safe], None),
+            "found": found
+        })
+
+
+def _parse_zip(zip_code):
+    # Parsed as the gazetteer does; invalid input maps to -1, which never matches a row
+    try:
+        return parse_zip(zip_code)
+    except ValueError:
+        return -1
+
+
+@load_once
+def get_zip_index():
+    """
+    The process-wide ZipIndex, built on first use.
+    """
+    return ZipIndex(get_zipcode_df())
 
 
 def get_state_from_zip(zip_code):
@@ -16,10 +124,20 @@ def get_state_from_zip(zip_code):
     Returns:
     - str: 2-letter state code (e.g. 'CA', 'PA')
     """
-    zip_code = str(zip_code)
-    match = zipcode_df[zipcode_df["Zip Code"] == zip_code]
+    try:
+        return get_zip_index().lookup(zip_code)["state"]
+    except ValueError:
+        raise ValueError(f"Could not find state for zip code {zip_code}")
 
-    if not match.empty:
-        return match.iloc[0]["State Abbrev."].upper()
-    else:
-        raise ValueError(f"Could not find state for zip code {zip_code}")
\ No newline at end of file
+
+def get_zip_attributes(zip_code):
+    """
+    Get the location attributes of a zip code from the local CSV dataset.
+
+    Parameters:
+    - zip_code (str or int): U.S. ZIP code
+
+    Returns:
+    - dict: 'state', 'county', 'fips' and 'energystar_zone' of the zip code.
+    """
+    return get_zip_index().lookup(zip_code)
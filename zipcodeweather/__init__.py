@@ -1,14 +1,25 @@
 # __init__.py
 
 from .config import WEATHER_STATIONS_PATH, CLIMATE_ZONE_GEOJSON_PATH
-from .geocoding import get_coordinates
-from .weather_station import find_nearest_weather_station
-from .climatezone import get_climate_zone_from_geojson
-import pandas as pd
-import geopandas as gpd
-
-
-__all__ = ["ZipCodeWeather", "get_coordinates", "find_nearest_weather_station", "get_climate_zone_from_geojson"]
+from .geocoding import get_coordinates, get_coordinates_nominatim, geocode_latency, nominatim_breaker
+from .resilience import CircuitBreaker, LatencyRecorder
+from .gazetteer import ZipGazetteer, get_default_gazetteer
+from .geocache import GeocodeCache, get_default_cache
+from .async_geocoding import get_coordinates_many, get_coordinates_many_async
+from .weather_station import find_nearest_weather_station, find_nearest_weather_stations, StationIndex, get_station_index, \
+    interpolate_weather
+from .climatezone import get_climate_zone_from_geojson, get_climate_zones_from_geojson, ClimateZoneIndex, get_climate_zone_index
+from .atlas import ZipAtlas, build_zip_atlas, get_default_atlas
+from .reference import get_weather_stations, get_climate_zone_gdf
+
+
+__all__ = ["ZipCodeWeather", "get_coordinates", "get_coordinates_nominatim", "geocode_latency", "nominatim_breaker",
+           "CircuitBreaker", "LatencyRecorder", "ZipGazetteer", "get_default_gazetteer",
+           "GeocodeCache", "get_default_cache", "get_coordinates_many", "get_coordinates_many_async",
+           "find_nearest_weather_station", "find_nearest_weather_stations", "StationIndex", "get_station_index",
+           "interpolate_weather", "get_climate_zone_from_geojson", "get_climate_zones_from_geojson",
+           "ClimateZoneIndex", "get_climate_zone_index", "ZipAtlas", "build_zip_atlas", "get_default_atlas",
+           "get_weather_stations", "get_climate_zone_gdf"]
 
 
 class ZipCodeWeather:
@@ -24,42 +35,77 @@ class ZipCodeWeather:
 
         Parameters:
         - weather_stations_df (pd.DataFrame): A DataFrame with columns 'Station_Name', 'Latitude', and 'Longitude'
-        """
-        # Load defaults if no custom paths are provided
-        self.weather_stations = weather_stations_df or pd.read_csv(WEATHER_STATIONS_PATH)
-        self.climate_zone = climate_zone_gdf or gpd.read_file(CLIMATE_ZONE_GEOJSON_PATH)
+        - climate_zone_gdf (gpd.GeoDataFrame): Climate zone polygons
 
-    def get_nearest_station(self, zip_code):
+        The default tables are shared by every instance and only read on first use.
+        """
+        self._weather_stations = weather_stations_df
+        self._climate_zone = climate_zone_gdf
+
+    @property
+    def weather_stations(self):
+        if self._weather_stations is None:
+            return get_weather_stations()
+        return self._weather_stations
+
+    @property
+    def climate_zone(self):
+        if self._climate_zone is None:
+            return get_climate_zone_gdf()
+        return self._climate_zone
+
+    def get_nearest_station(self, zip_code, user_coords=None, k=1):
         """
         Get the nearest weather station to the specified zip code.
 
         Parameters:
         - zip_code (str): The zip code provided by the user.
+        - user_coords (tuple): Already resolved coordinates of the zip code, if available.
+        - k (int): With k > 1, return weather interpolated from the k nearest stations instead.
 
         Returns:
         - dict: Information of the nearest weather station.
         """
         try:
-            user_coords = get_coordinates(zip_code)
+            if user_coords is None:
+                user_coords = get_coordinates(zip_code)
+            if k > 1:
+                return self.interpolate_weather([user_coords[0]], [user_coords[1]], k=k).iloc[0].to_dict()
             nearest_station = find_nearest_weather_station(user_coords, self.weather_stations)
             return nearest_station.to_dict()
         except ValueError as e:
             print(f"Error: {e}")
             return None
 
-    def get_climate_zone(self, zip_code):
+    def interpolate_weather(self, lats, lons, k=4, power=2.0):
+        """
+        Interpolate station weather to many locations by inverse distance weighting.
+
+        Parameters:
+        - lats, lons (array-like): Latitudes and longitudes of the locations.
+        - k (int): Number of nearest stations used per location.
+        - power (float): Distance exponent of the weights.
+
+        Returns:
+        - pd.DataFrame: Interpolated numeric weather columns, one row per location.
+        """
+        return interpolate_weather(lats, lons, self.weather_stations, k=k, power=power)
+
+    def get_climate_zone(self, zip_code, user_coords=None):
         """
         Get the climate zone for the specified zip code.
 
         Parameters:
         - zip_code (str): The zip code provided by the user.
+        - user_coords (tuple): Already resolved coordinates of the zip code, if available.
 
         Returns:
         - str: The climate zone of the location.
         """
         try:
             # Get user coordinates from zip code
-            user_coords = get_coordinates(zip_code)
+            if user_coords is None:
+                user_coords = get_coordinates(zip_code)
 
             # Get the climate zone based on user coordinates
             climate_zone = get_climate_zone_from_geojson(user_coords, self.climate_zone)
@@ -69,6 +115,18 @@ class ZipCodeWeather:
             print(f"Error: {e}")
             return None
 
+    def get_climate_zones(self, lats, lons):
+        """
+        Get the climate zones for arrays of coordinates in one vectorized spatial join.
+
+        Parameters:
+        - lats, lons (array-like): Latitudes and longitudes of the locations.
+
+        Returns:
+        - pd.DataFrame: 'BA_Climate_Zone', 'ASHRAE_IECC_Climate_Zone' and a boolean 'found' flag per location.
+        """
+        return get_climate_zones_from_geojson(lats, lons, self.climate_zone)
+
 # Example usage:
 # Initialize the weather stations DataFrame and GeoJSON file path
 # app = ZipCodeWeatherApp(weather_stations_df, "climate_zones.geojson")
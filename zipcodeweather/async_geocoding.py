@@ -0,0 +1,117 @@
+# async_geocoding.py
+
+import asyncio
+import time
+from .config import NOMINATIM_URL, GEOCODE_REQUESTS_PER_SECOND, ALLOW_REMOTE_GEOCODING
+from .gazetteer import get_default_gazetteer
+from .geocache import get_default_cache
+
+
+class RateLimiter:
+    """
+    Spaces out coroutine calls so that at most `rate` of them start per second.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def _fetch_coordinates(session, limiter, base_url, zip_code, country_code):
+    await limiter.wait()
+    params = {"postalcode": zip_code, "countrycodes": country_code, "format": "json"}
+    try:
+        async with session.get(base_url, params=params) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+    except Exception as e:
+        print(f"Error: geocoding {zip_code} failed ({e})")
+        return None
+    if data:
+        return float(data[0]["lat"]), float(data[0]["lon"])
+    return None
+
+
+async def get_coordinates_many_async(zip_codes, country_code="US", requests_per_second=GEOCODE_REQUESTS_PER_SECOND,
+                                     max_connections=8, base_url=NOMINATIM_URL, use_local=True,
+                                     allow_remote=ALLOW_REMOTE_GEOCODING, cache=None):
+    """
+    Geocode many zip codes concurrently over a pooled HTTP session.
+
+    Inputs are deduplicated, served from the local gazetteer and geocode cache
+    where possible, and the remainder is requested from Nominatim (or a
+    compatible server at base_url) no faster than requests_per_second.
+
+    Parameters:
+    - zip_codes (list): Zip codes to convert.
+    - country_code (str): The country code (default is "US" for United States).
+    - requests_per_second (float): Upper bound on remote request rate (0 disables the limit).
+    - max_connections (int): Size of the HTTP connection pool.
+    - base_url (str): Search endpoint of the geocoding server.
+    - use_local (bool): Whether to consult the gazetteer and geocode cache first.
+    - allow_remote (bool): Whether to query the remote server at all.
+    - cache (GeocodeCache): Cache to use (default is the process-wide cache).
+
+    Returns:
+    - list: (latitude, longitude) tuples in input order, None where a zip code could not be located.
+    """
+    import aiohttp
+
+    keys = [str(z).strip() for z in zip_codes]
+    unique = list(dict.fromkeys(keys))
+    resolved = {}
+
+    if use_local:
+        if cache is None:
+            cache = get_default_cache()
+        gazetteer = get_default_gazetteer() if country_code == "US" else None
+        for zip_code in unique:
+            if gazetteer is not None:
+                try:
+                    resolved[zip_code] = gazetteer.lookup(zip_code)
+                    continue
+                except ValueError:
+                    pass
+            coords = cache.get(f"{country_code}:{zip_code}")
+            if coords is not None:
+                resolved[zip_code] = coords
+
+    pending = [z for z in unique if z not in resolved]
+    if pending and allow_remote:
+        limiter = RateLimiter(requests_per_second)
+        connector = aiohttp.TCPConnector(limit=max_connections)
+        headers = {"User-Agent": "zip-code-weather"}
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            results = await asyncio.gather(*(
+                _fetch_coordinates(session, limiter, base_url, zip_code, country_code) for zip_code in pending
+            ))
+        for zip_code, coords in zip(pending, results):
+            resolved[zip_code] = coords
+            if coords is not None and use_local:
+                cache.set(f"{country_code}:{zip_code}", coords)
+
+    return [resolved.get(key) for key in keys]
+
+
+def get_coordinates_many(zip_codes, base_url=NOMINATIM_URL, **kwargs):
+    """
+    Synchronous wrapper around get_coordinates_many_async for scripts and batch jobs.
+
+    Parameters:
+    - zip_codes (list): Zip codes to convert.
+    - base_url (str): Search endpoint of the geocoding server, e.g. a local stand-in for testing.
+    - **kwargs: Passed through to get_coordinates_many_async.
+
+    Returns:
+    - list: (latitude, longitude) tuples in input order, None where a zip code could not be located.
+    """
+    return asyncio.run(get_coordinates_many_async(zip_codes, base_url=base_url, **kwargs))
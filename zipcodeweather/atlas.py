@@ -0,0 +1,183 @@
+# atlas.py
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from shared import load_once
+from .config import (WEATHER_STATIONS_PATH, CLIMATE_ZONE_GEOJSON_PATH, ZIPCODE_COUNTY_PATH, ZIP_ATLAS_PATH,
+                     ZIP_CENTROIDS_PATH)
+from .gazetteer import ZIP_SPACE, parse_zip, get_default_gazetteer
+from .reference import get_weather_stations, get_climate_zone_gdf
+
+# Marks a ZIP (or a climate zone code) that the atlas could not resolve
+MISSING = -1
+# Smallest share of ClimateZones_County.csv ZIPs an atlas must locate to be written
+MIN_LOCATED_SHARE = 0.5
+
+
+def reference_fingerprint(weather_stations_path=WEATHER_STATIONS_PATH, climate_zone_path=CLIMATE_ZONE_GEOJSON_PATH):
+    """
+    Hash of the reference data the atlas was built from.
+
+    Station indices in the atlas are row positions in weather_data.csv, so an
+    atlas is only valid for the exact files it was built against.
+    """
+    digest = hashlib.sha256()
+    for path in (weather_stations_path, climate_zone_path):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_zip_atlas(output_path=ZIP_ATLAS_PATH, allow_remote=False):
+    """
+    Resolve every ZIP in ClimateZones_County.csv to its nearest station and climate zones.
+
+    Parameters:
+    - output_path (str): Where to write the .npz artifact.
+    - allow_remote (bool): Geocode ZIPs missing from the local gazetteer through Nominatim
+      (rate limited, so slow for many ZIPs).
+
+    Returns:
+    - ZipAtlas: The atlas that was written.
+
+    Raises:
+    - ValueError: If fewer than MIN_LOCATED_SHARE of the ZIPs could be located; nothing is written.
+    """
+    from .weather_station import get_station_index
+    from .climatezone import get_climate_zone_index
+
+    zips = pd.read_csv(ZIPCODE_COUNTY_PATH, usecols=["Zip Code"])["Zip Code"].to_numpy(dtype=np.int64)
+    lats, lons = get_default_gazetteer().lookup_many(zips)
+
+    if allow_remote:
+        from .async_geocoding import get_coordinates_many
+        missing = np.flatnonzero(np.isnan(lats))
+        coords = get_coordinates_many([f"{z:05d}" for z in zips[missing]])
+        for i, c in zip(missing, coords):
+            if c is not None:
+                lats[i], lons[i] = c
+
+    located = ~np.isnan(lats)
+    if located.mean() < MIN_LOCATED_SHARE:
+        centroids = ("is missing" if not os.path.exists(ZIP_CENTROIDS_PATH) else "covers too few of them")
+        raise ValueError(
+            f"Only {located.sum()} of {len(zips)} ZIP codes could be located, so no atlas was written. "
+            f"The ZIP centroid table {ZIP_CENTROIDS_PATH} {centroids}; build it with "
+            f"'python -m zipcodeweather.gazetteer <2020_Gaz_zcta_national.txt>'"
+            + ("." if allow_remote else ", or pass --remote to geocode the rest (about one ZIP per second).")
+        )
+    station = np.full(len(zips), MISSING, dtype=np.int32)
+    _, nearest = get_station_index(get_weather_stations()).query(lats[located], lons[located], k=1, refine=True)
+    station[located] = nearest[:, 0]
+
+    zone_index = get_climate_zone_index(get_climate_zone_gdf())
+    zone_rows = np.full(len(zips), MISSING, dtype=np.int64)
+    zone_rows[located] = zone_index.find_rows(lats[located], lons[located])
+    ba_names, ba_codes = np.unique(zone_index.ba_zones.astype(str), return_inverse=True)
+    iecc_names, iecc_codes = np.unique(zone_index.iecc_zones.astype(str), return_inverse=True)
+    has_zone = zone_rows >= 0
+
+    # Dense arrays indexed by integer ZIP; one read answers a lookup
+    arrays = {
+        "station": np.full(ZIP_SPACE, MISSING, dtype=np.int16),
+        "ba_zone": np.full(ZIP_SPACE, MISSING, dtype=np.int8),
+        "iecc_zone": np.full(ZIP_SPACE, MISSING, dtype=np.int8),
+        "lat": np.full(ZIP_SPACE, np.nan, dtype=np.float32),
+        "lon": np.full(ZIP_SPACE, np.nan, dtype=np.float32),
+    }
+    arrays["station"][zips] = station
+    arrays["ba_zone"][zips[has_zone]] = ba_codes[zone_rows[has_zone]]
+    arrays["iecc_zone"][zips[has_zone]] = iecc_codes[zone_rows[has_zone]]
+    arrays["lat"][zips] = lats
+    arrays["lon"][zips] = lons
+
+    np.savez_compressed(output_path, ba_names=ba_names, iecc_names=iecc_names,
+                        fingerprint=np.array(reference_fingerprint()), **arrays)
+    return ZipAtlas(output_path)
+
+
+class ZipAtlas:
+    """
+    Prebuilt ZIP -> (coordinates, nearest station, BA/IECC climate zone) table.
+
+    Built offline by build_zip_atlas so that runtime lookups are a single array
+    read instead of geocoding, distance and point-in-polygon computations.
+    """
+
+    def __init__(self, path=ZIP_ATLAS_PATH):
+        with np.load(path) as data:
+            self.station = data["station"]
+            self.ba_zone = data["ba_zone"]
+            self.iecc_zone = data["iecc_zone"]
+            self.lat = data["lat"]
+            self.lon = data["lon"]
+            self.ba_names = data["ba_names"]
+            self.iecc_names = data["iecc_names"]
+            self.fingerprint = str(data["fingerprint"])
+
+    def __len__(self):
+        return int(((self.station != MISSING) & (self.ba_zone != MISSING)).sum())
+
+    def is_current(self):
+        """
+        Return True if the atlas was built from the reference data on disk.
+        """
+        return self.fingerprint == reference_fingerprint()
+
+    def lookup(self, zip_code):
+        """
+        Resolve a zip code from the atlas.
+
+        Parameters:
+        - zip_code (str or int): The zip code to look up.
+
+        Returns:
+        - dict: 'coordinates', 'station_index' (row position in weather_data.csv) and
+          'climate_zone' (BA_Climate_Zone / ASHRAE_IECC_Climate_Zone).
+        """
+        z = parse_zip(zip_code)
+        station, ba, iecc = self.station[z], self.ba_zone[z], self.iecc_zone[z]
+        if station == MISSING or ba == MISSING:
+            raise ValueError(f"Zip code {zip_code} is not in the ZIP atlas.")
+        return {
+            "coordinates": (float(self.lat[z]), float(self.lon[z])),
+            "station_index": int(station),
+            "climate_zone": {
+                "BA_Climate_Zone": str(self.ba_names[ba]),
+                "ASHRAE_IECC_Climate_Zone": str(self.iecc_names[iecc])
+            }
+        }
+
+
+@load_once
+def get_default_atlas():
+    """
+    Return the process-wide atlas, or None if it has not been built or is out of date.
+    """
+    if not os.path.exists(ZIP_ATLAS_PATH):
+        return None
+    atlas = ZipAtlas(ZIP_ATLAS_PATH)
+    if not atlas.is_current():
+        print("Warning: ZIP atlas is out of date with the reference data; rebuild it with "
+              "'python -m zipcodeweather.atlas build'")
+        return None
+    return atlas
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("Usage: python -m zipcodeweather.atlas build [--remote] [output.npz]")
+        sys.exit(1)
+    args = sys.argv[2:]
+    remote = "--remote" in args
+    paths = [a for a in args if a != "--remote"]
+    try:
+        atlas = build_zip_atlas(*(paths[:1] or [ZIP_ATLAS_PATH]), allow_remote=remote)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Resolved {len(atlas)} ZIP codes")
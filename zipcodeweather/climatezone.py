@@ -1,13 +1,125 @@
 # climatezone.py
 
-import geopandas as gpd
-from shapely.geometry import Point
-import os
+import weakref
+import numpy as np
+import pandas as pd
+from .reference import get_climate_zone_gdf
+
+
+class ClimateZoneIndex:
+    """
+    A spatial index over climate zone polygons.
+
+    Multi-polygons are split into their parts, each part is prepared, and an
+    STRtree over the parts narrows every query to the few parts whose bounding
+    box holds the point before the exact point-in-polygon test.
+
+    Tie-break rule: a point covered by more than one zone (i.e. lying on a
+    shared boundary) is assigned to the zone that comes first in the GeoJSON.
+    Interior points get the same zone as a scan of the file in order.
+    """
+
+    def __init__(self, climate_zone):
+        """
+        Build the index.
+
+        Parameters:
+        - climate_zone (gpd.GeoDataFrame): Climate zone polygons with 'BA_Climate_Zone',
+          'IECC_Climate_Zone' and 'IECC_Moisture_Regime' columns.
+        """
+        import shapely
+
+        self.climate_zone = climate_zone
+        parts = climate_zone.geometry.reset_index(drop=True).explode(index_parts=False)
+        self.part_rows = parts.index.to_numpy()
+        self.parts = parts.to_numpy()
+        shapely.prepare(self.parts)
+        self.tree = shapely.STRtree(self.parts)
+
+        self.ba_zones = climate_zone['BA_Climate_Zone'].to_numpy()
+        self.iecc_zones = np.array([f"{zone}{moisture}" for zone, moisture in
+                                    zip(climate_zone['IECC_Climate_Zone'], climate_zone['IECC_Moisture_Regime'])],
+                                   dtype=object)
+
+    def find_row(self, lat, lon):
+        """
+        Positional row of the zone covering a point.
+
+        Parameters:
+        - lat (float): Latitude of the location.
+        - lon (float): Longitude of the location.
+
+        Returns:
+        - int: Positional row in the climate zone GeoDataFrame, or -1 if no zone covers the point.
+        """
+        import shapely
+
+        point = shapely.Point(lon, lat)
+        candidates = self.tree.query(point)
+        hits = candidates[shapely.covers(self.parts[candidates], point)]
+        if len(hits) == 0:
+            return -1
+        return int(self.part_rows[hits].min())
+
+    def find_rows(self, lats, lons):
+        """
+        Vectorized find_row for arrays of coordinates.
+
+        Parameters:
+        - lats, lons (array-like): Latitudes and longitudes of the locations.
+
+        Returns:
+        - np.ndarray: Positional zone row per location, -1 where no zone covers it.
+        """
+        import shapely
+
+        points = shapely.points(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+        points = np.atleast_1d(points)
+        point_idx, part_idx = self.tree.query(points)
+        covered = shapely.covers(self.parts[part_idx], points[point_idx])
+
+        # Lowest zone row per point, following the same tie-break rule as find_row
+        rows = np.full(len(points), len(self.ba_zones), dtype=np.int64)
+        np.minimum.at(rows, point_idx[covered], self.part_rows[part_idx[covered]])
+        rows[rows == len(self.ba_zones)] = -1
+        return rows
+
+    def lookup(self, lat, lon):
+        """
+        Climate zones of a point.
+
+        Parameters:
+        - lat (float): Latitude of the location.
+        - lon (float): Longitude of the location.
+
+        Returns:
+        - dict: 'BA_Climate_Zone' and 'ASHRAE_IECC_Climate_Zone' of the point.
+        """
+        row = self.find_row(lat, lon)
+        if row < 0:
+            raise ValueError("Climate zone not found for this location.")
+        return {
+            'BA_Climate_Zone': self.ba_zones[row],
+            'ASHRAE_IECC_Climate_Zone': self.iecc_zones[row]
+        }
+
+
+# Indexes are built once per climate zone GeoDataFrame
+_climate_zone_indexes = {}
+
+
+def get_climate_zone_index(climate_zone):
+    """
+    Return the ClimateZoneIndex for a climate zone GeoDataFrame, building it on first use.
+    """
+    key = id(climate_zone)
+    entry = _climate_zone_indexes.get(key)
+    if entry is None or entry[0]() is not climate_zone:
+        entry = (weakref.ref(climate_zone, lambda _: _climate_zone_indexes.pop(key, None)),
+                 ClimateZoneIndex(climate_zone))
+        _climate_zone_indexes[key] = entry
+    return entry[1]
 
-# Load the default weather stations DataFrame
-BASE_DIR = os.path.dirname(__file__)
-CLIMATE_ZONE_GEOJSON_PATH = os.path.join(BASE_DIR, '../data/Climate_Zones_-_DOE_Building_America_Program.geojson')
-default_climate_zone = gpd.read_file(CLIMATE_ZONE_GEOJSON_PATH)
 
 def get_climate_zone_from_geojson(user_coords, climate_zone=None):
     """
@@ -15,31 +127,50 @@ def get_climate_zone_from_geojson(user_coords, climate_zone=None):
     if the point falls within any of the climate zones in a GeoJSON file.
 
     Parameters:
-    - lat (float): Latitude of the location.
-    - lon (float): Longitude of the location.
+    - user_coords (tuple): Latitude and longitude of the location.
     - climate_zones (gpd.DataFrame): A geopanda DataFrame containing climate zones and geometries (Polygons).
 
     Returns:
-    - str: The climate zone that the point falls within.
+    - dict: The BA and ASHRAE IECC climate zones that the point falls within.
     """
 
     # Use default if no weather_stations DataFrame is provided
     if climate_zone is None:
-        climate_zone = default_climate_zone
+        climate_zone = get_climate_zone_gdf()
 
     lat = user_coords[0]
     lon = user_coords[1]
 
-    # Create a point from the latitude and longitude
-    point = Point(lon, lat)
+    return get_climate_zone_index(climate_zone).lookup(lat, lon)
+
+
+def get_climate_zones_from_geojson(lats, lons, climate_zone=None):
+    """
+    Determine the climate zones of many locations in one spatial join.
+
+    Parameters:
+    - lats, lons (array-like): Latitudes and longitudes of the locations.
+    - climate_zone (gpd.GeoDataFrame): Climate zone polygons (default is the DOE Building America GeoJSON).
+
+    Returns:
+    - pd.DataFrame: 'BA_Climate_Zone' and 'ASHRAE_IECC_Climate_Zone' per location (missing on a miss),
+      and a boolean 'found' column flagging locations outside every zone.
+    """
+    if climate_zone is None:
+        climate_zone = get_climate_zone_gdf()
 
-    # Check each polygon to see if the point falls within
-    for _, row in climate_zone.iterrows():
-        if row['geometry'].contains(point):
-            return {
-                'BA_Climate_Zone': row['BA_Climate_Zone'],
-                'ASHRAE_IECC_Climate_Zone': f"{row['IECC_Climate_Zone']}{row['IECC_Moisture_Regime']}"
-            }
+    index = get_climate_zone_index(climate_zone)
+    rows = index.find_rows(lats, lons)
+    found = rows >= 0
+    return pd.DataFrame({
+        'BA_Climate_Zone': np.where(found, index.ba_zones[rows], None),
+        'ASHRAE_IECC_Climate_Zone': np.where(found, index.iecc_zones[rows], None),
+        'found': found
+    })
 
 
-    raise ValueError("Climate zone not found for this location.")
\ No newline at end of file
+def __getattr__(name):
+    # The default climate zone polygons are loaded lazily on first access
+    if name == "default_climate_zone":
+        return get_climate_zone_gdf()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,4 +7,24 @@ BASE_DIR = os.path.dirname(__file__)
 
 # Paths to data files
 WEATHER_STATIONS_PATH = os.path.join(BASE_DIR, '../data/weather_data.csv')
-CLIMATE_ZONE_GEOJSON_PATH = os.path.join(BASE_DIR, '../data/Climate_Zones_-_DOE_Building_America_Program.geojson')
\ No newline at end of file
+CLIMATE_ZONE_GEOJSON_PATH = os.path.join(BASE_DIR, '../data/Climate_Zones_-_DOE_Building_America_Program.geojson')
+ZIP_CENTROIDS_PATH = os.path.join(BASE_DIR, '../data/zip_centroids.csv')
+ZIPCODE_COUNTY_PATH = os.path.join(BASE_DIR, '../data/ClimateZones_County.csv')
+ZIP_ATLAS_PATH = os.path.join(BASE_DIR, '../data/zip_atlas.npz')
+
+# Geocoding behaviour
+NOMINATIM_URL = os.environ.get("ZIPCODEWEATHER_NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+# Nominatim's usage policy allows at most one request per second
+GEOCODE_REQUESTS_PER_SECOND = float(os.environ.get("ZIPCODEWEATHER_REQUESTS_PER_SECOND", 1.0))
+# Upper bound in seconds on a single get_coordinates call, whatever the remote provider does
+GEOCODE_DEADLINE = float(os.environ.get("ZIPCODEWEATHER_GEOCODE_DEADLINE", 3.0))
+# Consecutive remote failures before the circuit breaker opens, and how long it stays open
+GEOCODE_FAILURE_THRESHOLD = int(os.environ.get("ZIPCODEWEATHER_FAILURE_THRESHOLD", 3))
+GEOCODE_COOLDOWN = float(os.environ.get("ZIPCODEWEATHER_COOLDOWN", 60.0))
+# Set ZIPCODEWEATHER_ALLOW_REMOTE=0 to never fall back to Nominatim (air-gapped deployments)
+ALLOW_REMOTE_GEOCODING = os.environ.get("ZIPCODEWEATHER_ALLOW_REMOTE", "1") != "0"
+
+# Persistent geocode cache (see geocache.py)
+GEOCODE_CACHE_DIR = os.environ.get("ZIPCODEWEATHER_CACHE_DIR", os.path.expanduser("~/.cache/zipcodeweather"))
+GEOCODE_CACHE_TTL = int(os.environ.get("ZIPCODEWEATHER_CACHE_TTL", 30 * 24 * 3600))  # seconds
+GEOCODE_CACHE_MAX_ENTRIES = int(os.environ.get("ZIPCODEWEATHER_CACHE_MAX_ENTRIES", 50000))
@@ -0,0 +1,151 @@
+# gazetteer.py
+
+import os
+import numpy as np
+import pandas as pd
+from shared import ZIP_SPACE, load_once, parse_zip
+from .config import ZIP_CENTROIDS_PATH, ZIPCODE_COUNTY_PATH
+
+
+class ZipGazetteer:
+    """
+    Offline ZIP code -> (latitude, longitude) lookup.
+
+    Centroids are held in dense arrays indexed by integer ZIP, so a lookup is a
+    single array read. ZIPs without a centroid of their own fall back to the mean
+    centroid of their county (from ClimateZones_County.csv), then to the mean
+    centroid of their three-digit ZIP prefix.
+    """
+
+    def __init__(self, centroids_df=None, county_df=None):
+        """
+        Build the lookup arrays.
+
+        Parameters:
+        - centroids_df (pd.DataFrame): Columns 'Zip Code', 'Latitude' and 'Longitude'.
+        - county_df (pd.DataFrame): Columns 'Zip Code' and 'FIPS Code' used for the county fallback.
+        """
+        if centroids_df is None:
+            centroids_df = load_zip_centroids()
+        if county_df is None:
+            county_df = pd.read_csv(ZIPCODE_COUNTY_PATH, usecols=["Zip Code", "FIPS Code"], dtype={"FIPS Code": str})
+
+        self.lat = np.full(ZIP_SPACE, np.nan)
+        self.lon = np.full(ZIP_SPACE, np.nan)
+        zips = centroids_df["Zip Code"].to_numpy(dtype=np.int64)
+        self.lat[zips] = centroids_df["Latitude"].to_numpy(dtype=float)
+        self.lon[zips] = centroids_df["Longitude"].to_numpy(dtype=float)
+        self.exact = ~np.isnan(self.lat)
+
+        # County fallback: ZIPs without a centroid take the mean of their county's known centroids
+        county = county_df[["Zip Code", "FIPS Code"]].copy()
+        county["Latitude"] = self.lat[county["Zip Code"].to_numpy()]
+        county["Longitude"] = self.lon[county["Zip Code"].to_numpy()]
+        county_means = county.groupby("FIPS Code")[["Latitude", "Longitude"]].transform("mean")
+        missing = county["Latitude"].isna() & county_means["Latitude"].notna()
+        filled = county.loc[missing, "Zip Code"].to_numpy()
+        self.lat[filled] = county_means.loc[missing, "Latitude"].to_numpy()
+        self.lon[filled] = county_means.loc[missing, "Longitude"].to_numpy()
+
+        # ZIP3 fallback: mean over every ZIP sharing the same three-digit prefix
+        known = np.flatnonzero(~np.isnan(self.lat))
+        prefix = known // 100
+        counts = np.bincount(prefix, minlength=ZIP_SPACE // 100)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.zip3_lat = np.bincount(prefix, weights=self.lat[known], minlength=ZIP_SPACE // 100) / counts
+            self.zip3_lon = np.bincount(prefix, weights=self.lon[known], minlength=ZIP_SPACE // 100) / counts
+
+    def __len__(self):
+        return int(self.exact.sum())
+
+    def lookup(self, zip_code):
+        """
+        Get the coordinates of a zip code without any network access.
+
+        Parameters:
+        - zip_code (str or int): The zip code to look up.
+
+        Returns:
+        - tuple: Latitude and longitude as floats.
+        """
+        zip_int = parse_zip(zip_code)
+        lat, lon = self.lat[zip_int], self.lon[zip_int]
+        if np.isnan(lat):
+            lat, lon = self.zip3_lat[zip_int // 100], self.zip3_lon[zip_int // 100]
+        if np.isnan(lat):
+            raise ValueError(f"Zip code {zip_code} not found in the local gazetteer.")
+        return float(lat), float(lon)
+
+    def lookup_many(self, zip_codes):
+        """
+        Vectorized lookup for an array of zip codes.
+
+        Parameters:
+        - zip_codes (array-like): Zip codes as strings or integers.
+
+        Returns:
+        - tuple: Arrays of latitudes and longitudes; NaN where no location is known.
+        """
+        zips = np.array([parse_zip(z) for z in zip_codes], dtype=np.int64)
+        lat, lon = self.lat[zips], self.lon[zips]
+        miss = np.isnan(lat)
+        lat[miss] = self.zip3_lat[zips[miss] // 100]
+        lon[miss] = self.zip3_lon[zips[miss] // 100]
+        return lat, lon
+
+
+def load_zip_centroids(path=ZIP_CENTROIDS_PATH):
+    """
+    Load the ZIP centroid table, returning an empty table if it has not been built.
+
+    Parameters:
+    - path (str): CSV with columns 'Zip Code', 'Latitude' and 'Longitude'.
+
+    Returns:
+    - pd.DataFrame: The centroid table.
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame({"Zip Code": pd.Series(dtype=int),
+                             "Latitude": pd.Series(dtype=float),
+                             "Longitude": pd.Series(dtype=float)})
+    return pd.read_csv(path, dtype={"Zip Code": int, "Latitude": float, "Longitude": float})
+
+
+def build_zip_centroids(gazetteer_path, output_path=ZIP_CENTROIDS_PATH):
+    """
+    Convert a U.S. Census ZCTA Gazetteer file into the centroid table used by ZipGazetteer.
+
+    Parameters:
+    - gazetteer_path (str): Tab-separated Census file with 'GEOID', 'INTPTLAT' and 'INTPTLONG' columns.
+    - output_path (str): Where to write the centroid CSV.
+
+    Returns:
+    - pd.DataFrame: The centroid table that was written.
+    """
+    df = pd.read_csv(gazetteer_path, sep="\t", dtype={"GEOID": str})
+    df.columns = df.columns.str.strip()
+    centroids = pd.DataFrame({
+        "Zip Code": df["GEOID"].astype(int),
+        "Latitude": df["INTPTLAT"].round(5),
+        "Longitude": df["INTPTLONG"].round(5)
+    }).sort_values("Zip Code")
+    centroids.to_csv(output_path, index=False)
+    return centroids
+
+
+@load_once
+def get_default_gazetteer():
+    """
+    Return the process-wide gazetteer, building it on first use.
+    """
+    return ZipGazetteer()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m zipcodeweather.gazetteer <2020_Gaz_zcta_national.txt> [output.csv]")
+        sys.exit(1)
+    table = build_zip_centroids(*sys.argv[1:3])
+    print(f"Wrote {len(table)} ZIP centroids")
@@ -0,0 +1,154 @@
+# geocache.py
+
+import os
+import sqlite3
+import threading
+import time
+from shared import load_once
+from .config import GEOCODE_CACHE_DIR, GEOCODE_CACHE_TTL, GEOCODE_CACHE_MAX_ENTRIES
+
+# Share of max_entries freed whenever the table is trimmed
+EVICTION_HEADROOM = 0.1
+
+
+class GeocodeCache:
+    """
+    A persistent SQLite cache of geocoding results.
+
+    Entries expire after a TTL, and the least recently used entries are evicted
+    once the cache grows past max_entries. Reads never write to disk: access
+    times of hits and removals of expired entries are saved with the next set.
+    Hits and misses are counted per process.
+    """
+
+    def __init__(self, cache_dir=GEOCODE_CACHE_DIR, ttl=GEOCODE_CACHE_TTL, max_entries=GEOCODE_CACHE_MAX_ENTRIES):
+        """
+        Open (or create) the cache database.
+
+        Parameters:
+        - cache_dir (str): Directory holding geocode_cache.sqlite. Use ":memory:" for a throwaway cache.
+        - ttl (float): Seconds before an entry expires.
+        - max_entries (int): Maximum number of entries kept on disk.
+        """
+        if cache_dir == ":memory:":
+            self.path = ":memory:"
+        else:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.path = os.path.join(cache_dir, "geocode_cache.sqlite")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Streamlit runs each session in its own thread, so share one connection behind a lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "key TEXT PRIMARY KEY, lat REAL, lon REAL, created REAL, accessed REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS geocode_accessed ON geocode (accessed)")
+        self._conn.commit()
+        # Pending writes from reads, and an upper bound on the rows on disk
+        self._accessed = {}
+        self._expired = set()
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def get(self, key):
+        """
+        Look up a cached result.
+
+        Parameters:
+        - key (str): Cache key, e.g. 'US:16803'.
+
+        Returns:
+        - tuple or None: Latitude and longitude, or None on a miss or expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT lat, lon, created FROM geocode WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[2] > self.ttl or key in self._expired:
+                if row is not None:
+                    self._expired.add(key)
+                    self._accessed.pop(key, None)
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            self.hits += 1
+            return row[0], row[1]
+
+    def set(self, key, coords):
+        """
+        Store a result, evicting least recently used entries if the cache is full.
+
+        Parameters:
+        - key (str): Cache key, e.g. 'US:16803'.
+        - coords (tuple): Latitude and longitude.
+        """
+        now = time.time()
+        with self._lock:
+            self._flush()
+            self._expired.discard(key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode (key, lat, lon, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, float(coords[0]), float(coords[1]), now, now)
+            )
+            self._rows += 1
+            if self._rows > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _flush(self):
+        # Write the access times and expirations recorded by get (the caller commits)
+        if self._expired:
+            self._conn.executemany("DELETE FROM geocode WHERE key = ?", [(key,) for key in self._expired])
+            self._expired.clear()
+        if self._accessed:
+            self._conn.executemany("UPDATE geocode SET accessed = ? WHERE key = ?",
+                                   [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+    def _evict(self):
+        # Counted only once the estimate passes max_entries, then trimmed with headroom
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        if self._rows > self.max_entries:
+            keep = int(self.max_entries * (1 - EVICTION_HEADROOM))
+            self._conn.execute(
+                "DELETE FROM geocode WHERE key IN ("
+                "SELECT key FROM geocode ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (keep,)
+            )
+            self._rows = keep
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM geocode")
+            self._conn.commit()
+            self._accessed.clear()
+            self._expired.clear()
+            self._rows = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def stats(self):
+        """
+        Return cache counters.
+
+        Returns:
+        - dict: 'hits', 'misses' and 'size' (number of stored entries).
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+@load_once
+def get_default_cache():
+    """
+    Return the process-wide geocode cache, opening it on first use.
+    """
+    return GeocodeCache()
@@ -1,23 +1,112 @@
 # geocoding.py
 
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .config import (ALLOW_REMOTE_GEOCODING, NOMINATIM_URL, GEOCODE_DEADLINE,
+                     GEOCODE_FAILURE_THRESHOLD, GEOCODE_COOLDOWN)
+from .gazetteer import get_default_gazetteer
+from .geocache import get_default_cache
+from .resilience import CircuitBreaker, LatencyRecorder
 
-def get_coordinates(zip_code, country_code="US"):
+# Shared across calls so an unhealthy provider is skipped by every session
+nominatim_breaker = CircuitBreaker(GEOCODE_FAILURE_THRESHOLD, GEOCODE_COOLDOWN)
+geocode_latency = LatencyRecorder()
+
+# Remote calls run here so a hung request can be abandoned once the deadline passes
+_remote_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nominatim")
+
+
+def get_coordinates(zip_code, country_code="US", allow_remote=ALLOW_REMOTE_GEOCODING, cache=None,
+                    deadline=GEOCODE_DEADLINE):
+    """
+    Convert a zip code to latitude and longitude.
+
+    Runs an ordered fallback chain: the local gazetteer (U.S. only), then the
+    persistent geocode cache, then OpenStreetMap's Nominatim API. The remote
+    stage is skipped while its circuit breaker is open and is abandoned once
+    the deadline has passed. Each stage's latency is recorded in geocode_latency.
+
+    Parameters:
+    - zip_code (str): The zip code to convert.
+    - country_code (str): The country code (default is "US" for United States).
+    - allow_remote (bool): Whether to fall back to Nominatim.
+    - cache (GeocodeCache): Cache to use (default is the process-wide cache).
+    - deadline (float): Maximum seconds spent in this call.
+
+    Returns:
+    - tuple: Latitude and longitude as floats.
+    """
+    start = time.monotonic()
+    if cache is None:
+        cache = get_default_cache()
+    key = f"{country_code}:{str(zip_code).strip()}"
+
+    if country_code == "US":
+        stage_start = time.monotonic()
+        try:
+            return get_default_gazetteer().lookup(zip_code)
+        except ValueError:
+            pass
+        finally:
+            geocode_latency.record("gazetteer", time.monotonic() - stage_start)
+
+    stage_start = time.monotonic()
+    coords = cache.get(key)
+    geocode_latency.record("cache", time.monotonic() - stage_start)
+    if coords is not None:
+        return coords
+
+    if not allow_remote:
+        raise ValueError(f"Zip code {zip_code} not found locally and remote geocoding is disabled.")
+    if not nominatim_breaker.allow():
+        raise ValueError(f"Zip code {zip_code} not found locally and the remote geocoder is unavailable.")
+
+    import requests
+
+    remaining = max(deadline - (time.monotonic() - start), 0.1)
+    stage_start = time.monotonic()
+    future = _remote_executor.submit(get_coordinates_nominatim, zip_code, country_code, remaining)
+    try:
+        coords = future.result(timeout=remaining)
+    except (requests.RequestException, FutureTimeoutError) as e:
+        nominatim_breaker.record_failure()
+        raise ValueError(f"Remote geocoding of zip code {zip_code} failed: {str(e) or 'deadline exceeded'}")
+    except ValueError:
+        # The provider answered; the zip code simply does not exist
+        nominatim_breaker.record_success()
+        raise
+    except Exception:
+        # An unexpected payload still ends the half-open trial, or remote geocoding stays blocked
+        nominatim_breaker.record_failure()
+        raise
+    finally:
+        geocode_latency.record("nominatim", time.monotonic() - stage_start)
+
+    nominatim_breaker.record_success()
+    cache.set(key, coords)
+    return coords
+
+
+def get_coordinates_nominatim(zip_code, country_code="US", timeout=GEOCODE_DEADLINE):
     """
     Convert a zip code to latitude and longitude using OpenStreetMap's Nominatim API.
 
     Parameters:
     - zip_code (str): The zip code to convert.
     - country_code (str): The country code (default is "US" for United States).
+    - timeout (float): Connect and read timeout in seconds.
 
     Returns:
     - tuple: Latitude and longitude as floats.
     """
-    url = f"https://nominatim.openstreetmap.org/search?postalcode={zip_code}&countrycodes={country_code}&format=json"
-    response = requests.get(url, headers={'User-Agent': 'zip-code-weather'})
+    import requests
+
+    url = f"{NOMINATIM_URL}?postalcode={zip_code}&countrycodes={country_code}&format=json"
+    response = requests.get(url, headers={'User-Agent': 'zip-code-weather'}, timeout=timeout)
+    response.raise_for_status()
     data = response.json()
 
     if data:
         return float(data[0]["lat"]), float(data[0]["lon"])
     else:
-        raise ValueError("Invalid zip code or location not found.")
\ No newline at end of file
+        raise ValueError("Invalid zip code or location not found.")
@@ -0,0 +1,22 @@
+# reference.py
+
+import pandas as pd
+from shared import load_once
+from .config import WEATHER_STATIONS_PATH, CLIMATE_ZONE_GEOJSON_PATH
+
+
+@load_once
+def get_weather_stations():
+    """
+    The weather station table from weather_data.csv, loaded on first use.
+    """
+    return pd.read_csv(WEATHER_STATIONS_PATH)
+
+
+@load_once
+def get_climate_zone_gdf():
+    """
+    The DOE Building America climate zone polygons, loaded on first use.
+    """
+    import geopandas as gpd
+    return gpd.read_file(CLIMATE_ZONE_GEOJSON_PATH)
@@ -0,0 +1,96 @@
+# resilience.py
+
+import threading
+import time
+from collections import defaultdict, deque
+import numpy as np
+
+
+class CircuitBreaker:
+    """
+    Stops calling an unhealthy provider for a cool-down window.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    allow() returns False until `cooldown` seconds have passed. It then lets a
+    single trial call through (half-open); a success closes the breaker and a
+    failure opens it for another cool-down window.
+    """
+
+    def __init__(self, failure_threshold=3, cooldown=60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """
+        Return True if a call to the provider may be attempted now.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyRecorder:
+    """
+    Keeps a rolling window of latencies per named stage.
+    """
+
+    def __init__(self, window=1000):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def stats(self):
+        """
+        Summarize the recorded latencies.
+
+        Returns:
+        - dict: Per stage, the sample count and p50/p99/max latency in milliseconds.
+        """
+        with self._lock:
+            samples = {stage: np.array(values) * 1000 for stage, values in self._samples.items() if values}
+        return {
+            stage: {
+                "count": len(values),
+                "p50_ms": float(np.percentile(values, 50)),
+                "p99_ms": float(np.percentile(values, 99)),
+                "max_ms": float(values.max())
+            }
+            for stage, values in samples.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
@@ -1,21 +1,150 @@
 # weather_station.py
 
-from geopy.distance import geodesic
+import weakref
+import numpy as np
 import pandas as pd
-import os
+from .reference import get_weather_stations
 
-# Load the default weather stations DataFrame
-BASE_DIR = os.path.dirname(__file__)
-WEATHER_STATIONS_PATH = os.path.join(BASE_DIR, '../data/weather_data.csv')
-default_weather_stations = pd.read_csv(WEATHER_STATIONS_PATH)
+# Mean Earth radius (km), used for great-circle distances
+EARTH_RADIUS_KM = 6371.0088
+# Geodesic and great-circle distances differ by well under 1.2%, so any station whose
+# great-circle distance is within this factor of the k-th nearest may be the true
+# k-th nearest on the ellipsoid
+REFINE_MARGIN = 1.012
 
-def find_nearest_weather_station(user_coords, weather_stations=None):
+
+def _unit_vectors(lats, lons):
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lon = np.radians(np.asarray(lons, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+class StationIndex:
+    """
+    A prebuilt spatial index over weather station coordinates.
+
+    Stations are stored as unit-sphere vectors so that great-circle distances to
+    any number of query points come from one matrix product. Results can
+    optionally be refined with exact geodesic distances on the candidates.
+    """
+
+    def __init__(self, weather_stations):
+        """
+        Build the index.
+
+        Parameters:
+        - weather_stations (pd.DataFrame): A DataFrame with 'Latitude' and 'Longitude' columns.
+        """
+        self.weather_stations = weather_stations
+        self.lats = weather_stations['Latitude'].to_numpy(dtype=float)
+        self.lons = weather_stations['Longitude'].to_numpy(dtype=float)
+        self.vectors = _unit_vectors(self.lats, self.lons)
+        # weather_data.csv repeats some stations; mark the first row at each coordinate
+        self.distinct = ~weather_stations.duplicated(subset=['Latitude', 'Longitude']).to_numpy()
+
+    def great_circle_km(self, lats, lons):
+        """
+        Great-circle distance from every query point to every station.
+
+        Parameters:
+        - lats, lons (array-like): Query coordinates.
+
+        Returns:
+        - np.ndarray: Distances in km with shape (n_queries, n_stations).
+        """
+        cos_angle = np.clip(_unit_vectors(lats, lons) @ self.vectors.T, -1.0, 1.0)
+        return EARTH_RADIUS_KM * np.arccos(cos_angle)
+
+    def query(self, lats, lons, k=1, refine=False, distinct=False, chunk_size=2048):
+        """
+        Find the k nearest stations to each query point.
+
+        Parameters:
+        - lats, lons (array-like): Query coordinates.
+        - k (int): Number of stations to return per query point.
+        - refine (bool): Re-rank candidates by exact geodesic distance, matching geopy results.
+        - distinct (bool): Skip stations that repeat the coordinates of an earlier row.
+        - chunk_size (int): Query points processed per matrix product, bounding memory use.
+
+        Returns:
+        - tuple: (distances_km, indices), each of shape (n_queries, k), nearest first.
+          Indices are positional (use .iloc on the stations DataFrame).
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        k = min(k, int(self.distinct.sum()) if distinct else len(self.lats))
+        distances = np.empty((len(lats), k))
+        indices = np.empty((len(lats), k), dtype=np.int64)
+
+        for start in range(0, len(lats), chunk_size):
+            stop = start + chunk_size
+            d = self.great_circle_km(lats[start:stop], lons[start:stop])
+            if distinct:
+                d[:, ~self.distinct] = np.inf
+            if k < d.shape[1]:
+                part = np.argpartition(d, k - 1, axis=1)[:, :k]
+            else:
+                part = np.tile(np.arange(d.shape[1]), (len(d), 1))
+            part_d = np.take_along_axis(d, part, axis=1)
+            order = np.lexsort((part, part_d), axis=1)
+            indices[start:stop] = np.take_along_axis(part, order, axis=1)
+            distances[start:stop] = np.take_along_axis(part_d, order, axis=1)
+
+            if refine:
+                from geopy.distance import geodesic
+
+                for row in range(len(d)):
+                    i = start + row
+                    candidates = np.flatnonzero(d[row] <= distances[i, -1] * REFINE_MARGIN + 1e-9)
+                    exact = np.array([geodesic((lats[i], lons[i]), (self.lats[c], self.lons[c])).km
+                                      for c in candidates])
+                    best = np.lexsort((candidates, exact))[:k]
+                    indices[i] = candidates[best]
+                    distances[i] = exact[best]
+
+        return distances, indices
+
+    def nearest(self, user_coords, refine=True):
+        """
+        Positional index of the station nearest to a single point.
+
+        Parameters:
+        - user_coords (tuple): Latitude and longitude.
+        - refine (bool): Use exact geodesic distance to break near-ties.
+
+        Returns:
+        - int: Positional index of the nearest station.
+        """
+        _, indices = self.query([user_coords[0]], [user_coords[1]], k=1, refine=refine)
+        return int(indices[0, 0])
+
+
+# Indexes are built once per stations DataFrame
+_station_indexes = {}
+
+
+def get_station_index(weather_stations):
+    """
+    Return the StationIndex for a stations DataFrame, building it on first use.
+    """
+    key = id(weather_stations)
+    entry = _station_indexes.get(key)
+    if entry is None or entry[0]() is not weather_stations:
+        entry = (weakref.ref(weather_stations, lambda _: _station_indexes.pop(key, None)),
+                 StationIndex(weather_stations))
+        _station_indexes[key] = entry
+    return entry[1]
+
+
+def find_nearest_weather_station(user_coords, weather_stations=None, refine=True):
     """
     Find the nearest weather station based on user's coordinates.
 
     Parameters:
     - user_coords (tuple): Latitude and longitude of the user's location.
     - weather_stations (pd.DataFrame): A DataFrame with columns 'Station_Name', 'Latitude', 'Longitude', and other weather parameters.
+    - refine (bool): Rank close candidates by exact geodesic distance (same result as a full geodesic scan).
 
     Returns:
     - pd.Series: Information of the nearest weather station.
@@ -23,10 +152,67 @@ def find_nearest_weather_station(user_coords, weather_stations=None):
 
     # Use default if no weather_stations DataFrame is provided
     if weather_stations is None:
-        weather_stations = default_weather_stations
+        weather_stations = get_weather_stations()
+
+    position = get_station_index(weather_stations).nearest(user_coords, refine=refine)
+    closest_station = weather_stations.iloc[position]
+    return closest_station
+
+
+def find_nearest_weather_stations(lats, lons, weather_stations=None, refine=False):
+    """
+    Find the nearest weather station for many coordinates at once.
+
+    Parameters:
+    - lats, lons (array-like): Latitudes and longitudes of the locations.
+    - weather_stations (pd.DataFrame): Stations to search (default is weather_data.csv).
+    - refine (bool): Rank close candidates by exact geodesic distance.
+
+    Returns:
+    - pd.DataFrame: One row of station information per location, in input order.
+    """
+    if weather_stations is None:
+        weather_stations = get_weather_stations()
+
+    _, indices = get_station_index(weather_stations).query(lats, lons, k=1, refine=refine)
+    return weather_stations.iloc[indices[:, 0]].reset_index(drop=True)
+
+
+def interpolate_weather(lats, lons, weather_stations=None, k=4, power=2.0):
+    """
+    Inverse-distance-weighted weather from the k nearest stations, for many locations at once.
+
+    Every numeric column of the stations DataFrame except the coordinates is
+    interpolated. A location that coincides with a station takes that station's values.
+
+    Parameters:
+    - lats, lons (array-like): Latitudes and longitudes of the locations.
+    - weather_stations (pd.DataFrame): Stations to interpolate from (default is weather_data.csv).
+    - k (int): Number of nearest stations used per location.
+    - power (float): Distance exponent of the weights.
+
+    Returns:
+    - pd.DataFrame: One row of interpolated weather per location, in input order.
+    """
+    if weather_stations is None:
+        weather_stations = get_weather_stations()
+
+    columns = [c for c in weather_stations.select_dtypes("number").columns if c not in ("Latitude", "Longitude")]
+    values = weather_stations[columns].to_numpy(dtype=float)
+
+    distances, indices = get_station_index(weather_stations).query(lats, lons, k=k, distinct=True)
+    exact = distances < 1e-6
+    with np.errstate(divide="ignore"):
+        weights = np.where(exact.any(axis=1, keepdims=True), exact.astype(float), 1.0 / distances ** power)
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    # (n, k) weights against (n, k, columns) neighbour values
+    interpolated = np.einsum("nk,nkc->nc", weights, values[indices])
+    return pd.DataFrame(interpolated, columns=columns)
+
 
-    distances = weather_stations.apply(
-        lambda row: geodesic(user_coords, (row['Latitude'], row['Longitude'])).km, axis=1
-    )
-    closest_station = weather_stations.loc[distances.idxmin()]
-    return closest_station
\ No newline at end of file
+def __getattr__(name):
+    # The default stations table is loaded lazily on first access
+    if name == "default_weather_stations":
+        return get_weather_stations()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")